@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
-from typing import List, Dict, Any
+from typing import List
 from app.core.database import get_postgres_session
 from app.services.ai_service import AzureOpenAIService
 from app.services.product_service import ProductService
@@ -10,6 +10,19 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ai", tags=["ai-services"])
 
+def _keyword_match_score(keywords_lower: List[str], product) -> float:
+    """Score a product against already-lowercased keywords in one pass over them"""
+    description = (product.description or "").lower()
+    name = product.name.lower()
+    
+    score = 0.5  # Default score
+    for keyword in keywords_lower:
+        if keyword in description:
+            score += 0.2
+        if keyword in name:
+            score += 0.3
+    return min(score, 1.0)
+
 @router.post("/extract-keywords")
 async def test_keyword_extraction(
     request_data: dict
@@ -57,22 +70,17 @@ async def test_product_matching(
         product_service = ProductService(postgres_session)
         matches = await product_service.search_products_by_keywords(keywords)
         
-        # Convert to the expected format with scores
-        formatted_matches = []
-        for product in matches:
-            # Calculate a simple score based on keyword matches
-            score = 0.5  # Default score
-            for keyword in keywords:
-                if keyword.lower() in product.description.lower():
-                    score += 0.2
-                if keyword.lower() in product.name.lower():
-                    score += 0.3
-            
-            formatted_matches.append({
+        # Convert to the expected format with scores; each product's name and
+        # description are lowercased once rather than once per keyword
+        keywords_lower = [keyword.lower() for keyword in keywords]
+        formatted_matches = [
+            {
                 "product_id": str(product.id),
-                "score": min(score, 1.0),
+                "score": _keyword_match_score(keywords_lower, product),
                 "product": product
-            })
+            }
+            for product in matches
+        ]
         
         return {
             "keywords": keywords,
@@ -123,20 +131,14 @@ async def test_full_ai_pipeline(
         products = await product_service.search_products_by_keywords(keywords)
         
         # Format products with scores for compatibility
-        matches = []
-        for product in products:
-            # Calculate simple score based on keyword matches
-            score = 0.5
-            for keyword in keywords:
-                if keyword.lower() in product.description.lower():
-                    score += 0.2
-                if keyword.lower() in product.name.lower():
-                    score += 0.3
-            
-            matches.append({
+        keywords_lower = [keyword.lower() for keyword in keywords]
+        matches = [
+            {
                 "product": product,
-                "score": min(score, 1.0)
-            })
+                "score": _keyword_match_score(keywords_lower, product)
+            }
+            for product in products
+        ]
         
         # Step 3: AI Response Generation
         logger.info("Step 3: Generating AI response...")
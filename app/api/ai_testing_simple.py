@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from typing import List, Dict, Any
+from collections import defaultdict
 from app.services.ai_service import AzureOpenAIService
 import logging
 
@@ -7,6 +8,61 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ai", tags=["ai-services"])
 
+# Mock catalog for the simplified pipeline (no DB dependency)
+MOCK_PRODUCTS = (
+    {
+        "product_description": "iPhone 15 Pro with 48MP Camera and A17 Pro Chip",
+        "product_tag": ["iphone", "smartphone", "camera", "apple", "phone", "mobile"],
+        "product_attributes": {"price": "$999"}
+    },
+    {
+        "product_description": "Dell XPS 15 Gaming Laptop with RTX 4060, Intel i7, 16GB RAM",
+        "product_tag": ["laptop", "gaming", "programming", "dell", "computer"],
+        "product_attributes": {"price": "$1499"}
+    },
+    {
+        "product_description": "Sony WH-1000XM4 Wireless Noise Canceling Headphones",
+        "product_tag": ["headphones", "wireless", "bluetooth", "audio", "sony"],
+        "product_attributes": {"price": "$349"}
+    },
+    {
+        "product_description": "Samsung Galaxy S24 Ultra with S Pen",
+        "product_tag": ["smartphone", "samsung", "android", "phone", "stylus"],
+        "product_attributes": {"price": "$1199"}
+    }
+)
+
+# Lowercased descriptions and a tag -> product positions index, built once
+# so a request scans each distinct tag once instead of every product's tags
+_MOCK_DESCRIPTIONS = tuple(product["product_description"].lower() for product in MOCK_PRODUCTS)
+_MOCK_TAG_INDEX: Dict[str, List[int]] = defaultdict(list)
+for _position, _product in enumerate(MOCK_PRODUCTS):
+    for _tag in _product["product_tag"]:
+        _MOCK_TAG_INDEX[_tag.lower()].append(_position)
+
+def _match_mock_products(keywords: List[str]) -> List[Dict[str, Any]]:
+    """Score the mock catalog against keywords: +0.3 for a tag match, +0.4 for a description match"""
+    scores = [0.0] * len(MOCK_PRODUCTS)
+    for keyword in keywords:
+        keyword = keyword.lower()
+        
+        tagged = set()
+        for tag, positions in _MOCK_TAG_INDEX.items():
+            if keyword in tag:
+                tagged.update(positions)
+        for position in tagged:
+            scores[position] += 0.3
+        
+        for position, description in enumerate(_MOCK_DESCRIPTIONS):
+            if keyword in description:
+                scores[position] += 0.4
+    
+    return [
+        {"product": MOCK_PRODUCTS[position], "score": min(score, 1.0)}
+        for position, score in enumerate(scores)
+        if score > 0
+    ]
+
 @router.post("/extract-keywords")
 async def test_keyword_extraction(
     request_data: dict
@@ -128,46 +184,7 @@ async def test_full_ai_pipeline(
         
         # Step 2: Mock product matching (since we don't have DB dependency)
         logger.info("Step 2: Simulating product matching...")
-        mock_matches = []
-        
-        # Simple keyword matching simulation
-        all_products = [
-            {
-                "product_description": "iPhone 15 Pro with 48MP Camera and A17 Pro Chip",
-                "product_tag": ["iphone", "smartphone", "camera", "apple", "phone", "mobile"],
-                "product_attributes": {"price": "$999"}
-            },
-            {
-                "product_description": "Dell XPS 15 Gaming Laptop with RTX 4060, Intel i7, 16GB RAM",
-                "product_tag": ["laptop", "gaming", "programming", "dell", "computer"],
-                "product_attributes": {"price": "$1499"}
-            },
-            {
-                "product_description": "Sony WH-1000XM4 Wireless Noise Canceling Headphones",
-                "product_tag": ["headphones", "wireless", "bluetooth", "audio", "sony"],
-                "product_attributes": {"price": "$349"}
-            },
-            {
-                "product_description": "Samsung Galaxy S24 Ultra with S Pen",
-                "product_tag": ["smartphone", "samsung", "android", "phone", "stylus"],
-                "product_attributes": {"price": "$1199"}
-            }
-        ]
-        
-        # Find matching products based on keywords
-        for product in all_products:
-            score = 0
-            for keyword in keywords:
-                if any(keyword.lower() in tag.lower() for tag in product["product_tag"]):
-                    score += 0.3
-                if keyword.lower() in product["product_description"].lower():
-                    score += 0.4
-            
-            if score > 0:
-                mock_matches.append({
-                    "product": product,
-                    "score": min(score, 1.0)
-                })
+        mock_matches = _match_mock_products(keywords)
         
         # Sort by score and take top 3
         mock_matches.sort(key=lambda x: x["score"], reverse=True)
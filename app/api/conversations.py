@@ -1,9 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from typing import List, Optional
+from typing import List
 from app.models.schemas import (
     CustomerMessage, ConversationResponse, Conversation,
-    ConversationCreate, ConversationBranch, ConversationMessage,
-    MessageSender
+    ConversationMessage
 )
 from app.core.database import get_postgres_session, get_mongo_db, get_redis_client
 from app.services.product_service import ProductService
@@ -14,7 +13,6 @@ from app.services.task_manager import task_manager
 from sqlalchemy.ext.asyncio import AsyncSession
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime
-import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import PlainTextResponse
-from typing import Dict, Any
 from app.core.config import settings
 import logging
 import hashlib
 import hmac
+import orjson
 from app.tasks.webhook_tasks import (
     process_facebook_webhook_task,
     process_instagram_webhook_task
@@ -14,6 +14,14 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/webhook", tags=["webhooks"])
 
+# Expected verify tokens, encoded once for constant-time comparison
+FACEBOOK_VERIFY_TOKEN = settings.facebook_verify_token.encode('utf-8')
+INSTAGRAM_VERIFY_TOKEN = settings.instagram_verify_token.encode('utf-8')
+
+def verify_token_matches(token: str, expected: bytes) -> bool:
+    """Compare a hub.verify_token against the expected token in constant time"""
+    return hmac.compare_digest((token or "").encode('utf-8'), expected)
+
 def verify_facebook_signature(payload: bytes, signature: str) -> bool:
     """Verify Facebook webhook signature for security"""
     try:
@@ -60,10 +68,11 @@ async def facebook_webhook_verification(request: Request):
         token = request.query_params.get("hub.verify_token")
         challenge = request.query_params.get("hub.challenge")
         
-        logger.info(f"Facebook webhook verification: mode={mode}, token_match={token == settings.facebook_verify_token}")
+        token_match = verify_token_matches(token, FACEBOOK_VERIFY_TOKEN)
+        logger.info(f"Facebook webhook verification: mode={mode}, token_match={token_match}")
         
         # Verify the webhook
-        if mode == "subscribe" and token == settings.facebook_verify_token:
+        if mode == "subscribe" and token_match:
             logger.info("Facebook webhook verified successfully")
             return PlainTextResponse(challenge)
         else:
@@ -89,9 +98,8 @@ async def facebook_webhook_handler(
         #     logger.warning("Facebook webhook signature verification failed")
         #     raise HTTPException(status_code=403, detail="Invalid signature")
         
-        # Parse JSON payload
-        import json
-        payload_data = json.loads(body.decode('utf-8'))
+        # Parse JSON payload straight from the raw bytes
+        payload_data = orjson.loads(body)
         
         logger.info(f"Received Facebook webhook: {payload_data}")
         
@@ -101,7 +109,7 @@ async def facebook_webhook_handler(
         logger.info("Facebook webhook task queued for processing")
         return {"status": "success", "message": "Webhook received and queued for processing"}
         
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Facebook webhook JSON parsing error: {e}")
         raise HTTPException(status_code=400, detail="Invalid JSON")
     except Exception as e:
@@ -116,9 +124,10 @@ async def instagram_webhook_verification(request: Request):
         token = request.query_params.get("hub.verify_token")
         challenge = request.query_params.get("hub.challenge")
         
-        logger.info(f"Instagram webhook verification: mode={mode}, token_match={token == settings.instagram_verify_token}")
+        token_match = verify_token_matches(token, INSTAGRAM_VERIFY_TOKEN)
+        logger.info(f"Instagram webhook verification: mode={mode}, token_match={token_match}")
         
-        if mode == "subscribe" and token == settings.instagram_verify_token:
+        if mode == "subscribe" and token_match:
             logger.info("Instagram webhook verified successfully")
             return PlainTextResponse(challenge)
         else:
@@ -143,8 +152,7 @@ async def instagram_webhook_handler(
         #     logger.warning("Instagram webhook signature verification failed")
         #     raise HTTPException(status_code=403, detail="Invalid signature")
         
-        import json
-        payload_data = json.loads(body.decode('utf-8'))
+        payload_data = orjson.loads(body)
         
         logger.info(f"Received Instagram webhook: {payload_data}")
         
@@ -154,7 +162,7 @@ async def instagram_webhook_handler(
         logger.info("Instagram webhook task queued for processing")
         return {"status": "success", "message": "Webhook received and queued for processing"}
         
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Instagram webhook JSON parsing error: {e}")
         raise HTTPException(status_code=400, detail="Invalid JSON")
     except Exception as e:
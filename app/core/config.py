@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from functools import cached_property
 from typing import Optional
 import os
 from dotenv import load_dotenv
@@ -23,6 +24,11 @@ class Settings(BaseSettings):
     postgres_db: str = "manipulator_ai"
     postgres_user: str = "postgres"
     postgres_password: str = "secure_password"
+    postgres_pool_size: int = 20
+    postgres_max_overflow: int = 10
+    postgres_pool_recycle: int = 1800
+    postgres_pool_timeout: float = 5.0
+    postgres_statement_cache_size: int = 1024
     
     mongodb_url: str = "mongodb://localhost:27017/manipulator_conversations"
     mongo_host: str = "localhost"
@@ -35,6 +41,8 @@ class Settings(BaseSettings):
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_password: Optional[str] = None
+    redis_max_connections: int = 64
+    redis_pool_timeout: float = 5.0
     
     # OpenAI Configuration
     openai_api_key: str = "sk-test-key"
@@ -47,6 +55,8 @@ class Settings(BaseSettings):
     azure_openai_endpoint: str = "https://your-resource.openai.azure.com/"
     azure_openai_api_version: str = "2024-02-15-preview"
     azure_openai_deployment_name: str = "your_deployment_name_here"
+    # Pooled HTTP connections shared by every AzureOpenAIService on an event loop
+    azure_openai_max_connections: int = 100
     
     # Social Media Webhooks
     facebook_verify_token: str = "default_facebook_token"
@@ -64,6 +74,19 @@ class Settings(BaseSettings):
     cors_origins: list = ["*"]
     allowed_hosts: list = ["*"]
     
+    # Connection URLs derived from the fields above. Settings do not change
+    # after startup, so each is assembled once and reused
+    @cached_property
+    def postgres_async_url(self) -> str:
+        """PostgreSQL URL using the asyncpg driver"""
+        return self.postgresql_url.replace("postgresql://", "postgresql+asyncpg://")
+    
+    @cached_property
+    def redis_url(self) -> str:
+        """Redis URL including the password when one is set"""
+        credentials = f":{self.redis_password}@" if self.redis_password else ""
+        return f"redis://{credentials}{self.redis_host}:{self.redis_port}"
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
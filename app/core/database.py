@@ -1,7 +1,10 @@
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 import redis.asyncio as aioredis
+import asyncio
 from contextlib import asynccontextmanager
 from app.core.config import settings
 from app.models.database import Base
@@ -25,13 +28,26 @@ class DatabaseManager:
     async def connect_postgresql(self):
         """Initialize PostgreSQL connection"""
         try:
-            # Convert postgresql:// to postgresql+asyncpg:// for async support
-            async_url = settings.postgresql_url.replace("postgresql://", "postgresql+asyncpg://")
+            # Keep up to postgres_statement_cache_size prepared statements per
+            # connection, so repeated queries skip the server-side parse/plan
+            async_url = make_url(settings.postgres_async_url).update_query_dict({
+                "prepared_statement_cache_size": str(settings.postgres_statement_cache_size)
+            })
             
             self.postgres_engine = create_async_engine(
                 async_url,
                 echo=settings.debug,
-                pool_pre_ping=True
+                pool_pre_ping=True,
+                pool_size=settings.postgres_pool_size,
+                max_overflow=settings.postgres_max_overflow,
+                pool_recycle=settings.postgres_pool_recycle,
+                # Fail fast when the pool is exhausted instead of queueing for 30s
+                pool_timeout=settings.postgres_pool_timeout,
+                connect_args={
+                    "statement_cache_size": settings.postgres_statement_cache_size,
+                    # Short OLTP queries only lose time to JIT compilation
+                    "server_settings": {"jit": "off", "application_name": settings.app_name}
+                }
             )
             
             # Create async session factory
@@ -47,6 +63,16 @@ class DatabaseManager:
             logger.error(f"Failed to connect to PostgreSQL: {e}")
             raise
     
+    async def warm_postgres_pool(self):
+        """Open every pooled PostgreSQL connection up front so early requests skip the connect handshake"""
+        async def touch_connection():
+            async with self.postgres_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        
+        # Checking out pool_size connections at once makes the pool open that many
+        await asyncio.gather(*(touch_connection() for _ in range(settings.postgres_pool_size)))
+        logger.info(f"PostgreSQL pool warmed with {settings.postgres_pool_size} connections")
+    
     async def connect_mongodb(self):
         """Initialize MongoDB connection"""
         try:
@@ -64,16 +90,21 @@ class DatabaseManager:
     async def connect_redis(self):
         """Initialize Redis connection"""
         try:
-            redis_url = f"redis://"
-            if settings.redis_password:
-                redis_url += f":{settings.redis_password}@"
-            redis_url += f"{settings.redis_host}:{settings.redis_port}"
-            
-            self.redis_client = await aioredis.from_url(
-                redis_url,
+            # A blocking pool caps open sockets: when every connection is busy,
+            # callers wait up to redis_pool_timeout for one to be released
+            # instead of opening another. The hiredis parser (requirements.txt)
+            # is picked up automatically when installed.
+            redis_pool = aioredis.BlockingConnectionPool.from_url(
+                settings.redis_url,
+                max_connections=settings.redis_max_connections,
+                timeout=settings.redis_pool_timeout,
                 encoding="utf-8",
-                decode_responses=True
+                decode_responses=True,
+                socket_keepalive=True,
+                health_check_interval=30
             )
+            # from_pool hands the pool to the client, so close() also disconnects it
+            self.redis_client = aioredis.Redis.from_pool(redis_pool)
             
             # Test connection
             await self.redis_client.ping()
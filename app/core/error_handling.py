@@ -3,7 +3,6 @@ Comprehensive Error Handling for ManipulatorAI
 Provides custom exceptions, error handlers, and recovery mechanisms
 """
 
-import traceback
 import logging
 from typing import Dict, Any, Optional, Callable
 from datetime import datetime
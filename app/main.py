@@ -4,21 +4,17 @@ Main application entry point with comprehensive logging, error handling, and mon
 """
 
 import time
-import asyncio
 from contextlib import asynccontextmanager
-from typing import Dict, Any
 
-from fastapi import FastAPI, Request, HTTPException, Depends
+from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
-from fastapi.openapi.docs import get_swagger_ui_html
+from fastapi.responses import ORJSONResponse
 from fastapi.openapi.utils import get_openapi
 
 # Core imports
 from app.core.config import settings
 from app.core.logging import (
-    logger_manager, 
     main_logger as logger,
     api_logger,
     performance_logger
@@ -39,7 +35,7 @@ from app.core.error_handling import (
 )
 
 # Database connections
-from app.core.database import get_mongo_db, get_postgres_session, get_redis_client
+from app.core.database import db_manager, get_mongo_db, get_redis_client
 
 # API routers
 from app.api import conversations
@@ -61,19 +57,27 @@ async def lifespan(app: FastAPI):
         # Initialize database connections
         logger.info("Initializing database connections...")
         
-        # Test MongoDB connection
+        # Open the PostgreSQL pool and warm it so the first requests do not
+        # pay the connection handshake
         try:
-            mongo_db = await anext(get_mongo_db())
-            await mongo_db.command("ping")
+            await db_manager.connect_postgresql()
+            await db_manager.warm_postgres_pool()
+            logger.info("✅ PostgreSQL connection established")
+        except Exception as e:
+            logger.error(f"❌ PostgreSQL connection failed: {e}")
+            raise
+        
+        # Open the MongoDB and Redis clients once; every request reuses them
+        # through the get_mongo_db/get_redis_client dependencies
+        try:
+            await db_manager.connect_mongodb()
             logger.info("✅ MongoDB connection established")
         except Exception as e:
             logger.error(f"❌ MongoDB connection failed: {e}")
             raise
         
-        # Test Redis connection
         try:
-            redis_client = await anext(get_redis_client())
-            await redis_client.ping()
+            await db_manager.connect_redis()
             logger.info("✅ Redis connection established")
         except Exception as e:
             logger.error(f"❌ Redis connection failed: {e}")
@@ -102,8 +106,8 @@ async def lifespan(app: FastAPI):
         # Cleanup resources
         logger.info("Cleaning up resources...")
         
-        # Close database connections if needed
-        # await close_database_connections()
+        # Close the shared clients and their connection pools once
+        await db_manager.close_connections()
         
         logger.info("✅ Application shutdown completed successfully")
         
@@ -156,6 +160,8 @@ app = FastAPI(
         "url": "https://opensource.org/licenses/MIT",
     },
     lifespan=lifespan,
+    # Encode every response body with orjson instead of the stdlib json encoder
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json"
@@ -275,7 +281,7 @@ async def health_check():
     try:
         # Check MongoDB
         try:
-            mongo_db = await anext(get_mongo_db())
+            mongo_db = await get_mongo_db()
             await mongo_db.command("ping")
             health_status["components"]["mongodb"] = {"status": "healthy", "response_time": None}
         except Exception as e:
@@ -284,7 +290,7 @@ async def health_check():
         
         # Check Redis
         try:
-            redis_client = await anext(get_redis_client())
+            redis_client = await get_redis_client()
             redis_start = time.time()
             await redis_client.ping()
             redis_time = (time.time() - redis_start) * 1000
@@ -312,7 +318,7 @@ async def health_check():
         
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=503,
             content={
                 "status": "unhealthy",
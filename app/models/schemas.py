@@ -1,7 +1,12 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
+import sys
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern short labels that many products share (categories, brands, currencies)"""
+    return sys.intern(value) if isinstance(value, str) else value
 
 # Enums for better type safety
 class InteractionType(str, Enum):
@@ -61,6 +66,11 @@ class ProductAttributes(BaseModel):
     brand: Optional[str] = None
     # Allow additional dynamic attributes
     
+    @field_validator("color", "category", "brand")
+    @classmethod
+    def intern_labels(cls, value: Optional[str]) -> Optional[str]:
+        return _intern(value)
+    
     class Config:
         extra = "allow"
 
@@ -73,6 +83,11 @@ class Product(BaseModel):
     category: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
     
+    @field_validator("currency", "category")
+    @classmethod
+    def intern_labels(cls, value: Optional[str]) -> Optional[str]:
+        return _intern(value)
+    
     class Config:
         orm_mode = True
 
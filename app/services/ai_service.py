@@ -1,11 +1,88 @@
-from openai import AsyncAzureOpenAI
+from openai import AsyncAzureOpenAI, DefaultAsyncHttpxClient
 from app.core.config import settings
+from app.services.response_cache import ResponseCache
 from typing import List, Dict, Any, Optional
+import asyncio
+import httpx
 import logging
 import json
+import weakref
 
 logger = logging.getLogger(__name__)
 
+# AzureOpenAIService is created per request and per task, so each instance
+# would otherwise open its own connection pool and pay a fresh TCP/TLS
+# handshake. Connections are bound to the loop that opened them (Celery tasks
+# run their own loops), so one pooled client is kept per event loop.
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+def _shared_http_client() -> Optional[httpx.AsyncClient]:
+    """Return the running loop's pooled HTTP client, or None outside a running loop"""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    
+    client = _http_clients.get(loop)
+    if client is None:
+        client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=settings.azure_openai_max_connections,
+                max_keepalive_connections=settings.azure_openai_max_connections
+            )
+        )
+        _http_clients[loop] = client
+    return client
+
+# Product keywords recognised by the offline keyword extraction fallback
+FALLBACK_PRODUCT_KEYWORDS = (
+    "smartphone", "phone", "mobile", "laptop", "computer", "headphones",
+    "audio", "wireless", "bluetooth", "camera", "gaming", "work",
+    "productivity", "music", "video", "battery", "screen", "display"
+)
+
+# Static system prompts for conversation replies. Each one is byte-identical
+# on every call and comes first, with the product, history and customer
+# message in the user turn after it, so the provider's prompt cache can
+# reuse the shared prefix across turns and customers.
+MANIPULATOR_WELCOME_SYSTEM_PROMPT = """You are a friendly, professional sales representative for a technology company.
+
+A customer just interacted with an advertisement for one of our products. The product and the interaction follow in the next message.
+
+TASK: Create a warm, human-like greeting message that:
+1. Acknowledges their interest in the specific product
+2. Highlights 1-2 key benefits of the product
+3. Offers to help them learn more
+4. Feels natural and conversational (not salesy)
+5. Keep it under 100 words
+
+Be enthusiastic but professional. Make it feel like a genuine human interaction."""
+
+MANIPULATOR_FOLLOW_UP_SYSTEM_PROMPT = """You are a helpful, friendly sales representative.
+
+You are continuing a conversation about the product described in the next message.
+
+Continue the conversation naturally, providing helpful information and gently encouraging the customer to consider the product."""
+
+CONVINCER_WELCOME_SYSTEM_PROMPT = """You are a helpful, persuasive but not pushy sales representative responding to a customer inquiry.
+
+The customer's message and the products recommended for it follow in the next message.
+
+TASK: Create a warm response that:
+1. Acknowledges their message warmly
+2. Shows you understand their needs
+3. Introduces the relevant products naturally
+4. Asks a follow-up question to engage them further
+5. Keep it conversational and helpful (under 120 words)
+
+Make it feel like a genuine, helpful human interaction."""
+
+CONVINCER_FOLLOW_UP_SYSTEM_PROMPT = """You are a helpful, persuasive but not pushy sales representative continuing a sales conversation.
+
+The conversation history, the customer's latest message and the available products follow in the next message.
+
+Respond naturally and helpfully, addressing their message and gently guiding toward a purchase decision."""
+
 class AzureOpenAIService:
     """Service class for Azure OpenAI API interactions"""
     
@@ -13,17 +90,33 @@ class AzureOpenAIService:
         self.client = AsyncAzureOpenAI(
             api_key=settings.azure_openai_api_key,
             api_version=settings.azure_openai_api_version,
-            azure_endpoint=settings.azure_openai_endpoint
+            azure_endpoint=settings.azure_openai_endpoint,
+            http_client=_shared_http_client()
         )
         self.deployment_name = settings.azure_openai_deployment_name
+        # Optional completion cache, consulted only by calls that pass cacheable=True
+        self.response_cache: Optional[ResponseCache] = None
     
     async def generate_completion(
         self, 
         messages: List[Dict[str, str]], 
         max_tokens: int = 1000,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        cacheable: bool = False
     ) -> str:
-        """Generate a completion using Azure OpenAI"""
+        """
+        Generate a completion using Azure OpenAI
+
+        Only calls marked cacheable are served from response_cache. Sampled
+        conversation replies must stay fresh per customer, so they never are.
+        """
+        cache_key = None
+        if cacheable and self.response_cache is not None:
+            cache_key = ResponseCache.make_key(messages, max_tokens, temperature)
+            cached = self.response_cache.lookup(cache_key)
+            if cached is not None:
+                return cached
+
         try:
             response = await self.client.chat.completions.create(
                 model=self.deployment_name,
@@ -32,7 +125,11 @@ class AzureOpenAIService:
                 temperature=temperature
             )
             
-            return response.choices[0].message.content.strip()
+            content = response.choices[0].message.content.strip()
+            # Only successful completions are cached, never the fallback below
+            if cache_key is not None:
+                self.response_cache.put(cache_key, content)
+            return content
             
         except Exception as e:
             logger.error(f"Azure OpenAI completion failed: {e}")
@@ -68,7 +165,8 @@ Return ONLY a JSON array of keywords, nothing else. Example: ["smartphone", "cam
                 {"role": "user", "content": prompt}
             ]
             
-            response = await self.generate_completion(messages, max_tokens=200, temperature=0.3)
+            # The same message and catalogue always map to the same keywords
+            response = await self.generate_completion(messages, max_tokens=200, temperature=0.3, cacheable=True)
             
             # Parse JSON response
             try:
@@ -90,18 +188,8 @@ Return ONLY a JSON array of keywords, nothing else. Example: ["smartphone", "cam
     
     def _fallback_keyword_extraction(self, message: str) -> List[str]:
         """Fallback keyword extraction without AI"""
-        common_product_keywords = [
-            "smartphone", "phone", "mobile", "laptop", "computer", "headphones",
-            "audio", "wireless", "bluetooth", "camera", "gaming", "work",
-            "productivity", "music", "video", "battery", "screen", "display"
-        ]
-        
         message_lower = message.lower()
-        extracted = []
-        
-        for keyword in common_product_keywords:
-            if keyword in message_lower:
-                extracted.append(keyword)
+        extracted = [keyword for keyword in FALLBACK_PRODUCT_KEYWORDS if keyword in message_lower]
         
         logger.info(f"Fallback keyword extraction: {extracted}")
         return extracted
@@ -142,35 +230,19 @@ Return ONLY a JSON array of keywords, nothing else. Example: ["smartphone", "cam
         product = product_info[0]  # Primary product from interaction
         
         if is_welcome:
-            prompt = f"""
-You are a friendly, professional sales representative for a technology company.
-
-SITUATION: A customer just {interaction_type}d on an advertisement for this product:
+            system_prompt = MANIPULATOR_WELCOME_SYSTEM_PROMPT
+            prompt = f"""SITUATION: A customer just {interaction_type}d on an advertisement for this product:
 - Product: {product.get('product_description', 'our product')}
 - Price: {product.get('product_attributes', {}).get('price', 'Contact for pricing')}
-- Key features: {', '.join(product.get('product_tag', []))}
-
-TASK: Create a warm, human-like greeting message that:
-1. Acknowledges their interest in the specific product
-2. Highlights 1-2 key benefits of the product
-3. Offers to help them learn more
-4. Feels natural and conversational (not salesy)
-5. Keep it under 100 words
-
-Be enthusiastic but professional. Make it feel like a genuine human interaction.
-"""
+- Key features: {', '.join(product.get('product_tag', []))}"""
         else:
             # Follow-up conversation
-            prompt = f"""
-You are continuing a conversation about this product:
-- Product: {product.get('product_description', 'our product')}
-- Price: {product.get('product_attributes', {}).get('price', 'Contact for pricing')}
-
-Continue the conversation naturally, providing helpful information and gently encouraging the customer to consider the product.
-"""
+            system_prompt = MANIPULATOR_FOLLOW_UP_SYSTEM_PROMPT
+            prompt = f"""- Product: {product.get('product_description', 'our product')}
+- Price: {product.get('product_attributes', {}).get('price', 'Contact for pricing')}"""
         
         messages = [
-            {"role": "system", "content": "You are a helpful, friendly sales representative."},
+            {"role": "system", "content": system_prompt},
             {"role": "user", "content": prompt}
         ]
         
@@ -194,46 +266,30 @@ Continue the conversation naturally, providing helpful information and gently en
                 summary = f"- {product.get('product_description', 'Product')[:60]}..."
                 product_summaries.append(summary)
             
-            prompt = f"""
-You are a helpful sales representative responding to a customer inquiry.
-
-CUSTOMER MESSAGE: "{customer_message}"
+            system_prompt = CONVINCER_WELCOME_SYSTEM_PROMPT
+            prompt = f"""CUSTOMER MESSAGE: "{customer_message}"
 
 RECOMMENDED PRODUCTS based on their message:
-{chr(10).join(product_summaries)}
-
-TASK: Create a warm response that:
-1. Acknowledges their message warmly
-2. Shows you understand their needs
-3. Introduces the relevant products naturally
-4. Asks a follow-up question to engage them further
-5. Keep it conversational and helpful (under 120 words)
-
-Make it feel like a genuine, helpful human interaction.
-"""
+{chr(10).join(product_summaries)}"""
         else:
             # Build conversation history for context
-            history_text = ""
+            history_lines = []
             for msg in conversation_history[-3:]:  # Last 3 messages for context
                 sender = "Customer" if msg.get("sender") == "customer" else "You"
-                history_text += f"{sender}: {msg.get('content', '')}\n"
+                history_lines.append(f"{sender}: {msg.get('content', '')}\n")
+            history_text = "".join(history_lines)
             
-            prompt = f"""
-You are continuing a sales conversation.
-
-CONVERSATION HISTORY:
+            system_prompt = CONVINCER_FOLLOW_UP_SYSTEM_PROMPT
+            prompt = f"""CONVERSATION HISTORY:
 {history_text}
 
 CUSTOMER'S LATEST MESSAGE: "{customer_message}"
 
 AVAILABLE PRODUCTS:
-{chr(10).join([f"- {p.get('product_description', 'Product')[:50]}..." for p in products[:2]])}
-
-Respond naturally and helpfully, addressing their message and gently guiding toward a purchase decision.
-"""
+{chr(10).join([f"- {p.get('product_description', 'Product')[:50]}..." for p in products[:2]])}"""
         
         messages = [
-            {"role": "system", "content": "You are a helpful, persuasive but not pushy sales representative."},
+            {"role": "system", "content": system_prompt},
             {"role": "user", "content": prompt}
         ]
         
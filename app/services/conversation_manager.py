@@ -4,19 +4,34 @@ Integrates sophisticated prompt engineering with conversation state management
 """
 
 from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
 from app.services.ai_service import AzureOpenAIService
 from app.services.prompt_engine import PromptEngine
 from app.services.product_service import ProductService
 from app.services.conversation_service import ConversationService
 from app.models.schemas import (
     ConversationMessage, MessageSender, ConversationStatus,
-    ConversationBranch, Product, ConversationContext
+    ConversationBranch, Product
 )
 from datetime import datetime
+import asyncio
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+def _phrase_pattern(phrases: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Compile phrases into one alternation so a message is scanned once per rule"""
+    return re.compile("|".join(re.escape(phrase) for phrase in phrases))
+
+# Conversations abandoned before they conclude are never cleaned up explicitly,
+# so per-conversation state is kept in LRU order and the oldest is evicted
+MAX_TRACKED_CONVERSATIONS = 10_000
+
+# Keyword rules for the fallback message analysis, checked in this order
+NEGATIVE_PATTERN = _phrase_pattern(("no", "not interested", "don't want", "too expensive", "bye", "goodbye"))
+POSITIVE_PATTERN = _phrase_pattern(("yes", "interested", "tell me more", "how much", "buy", "purchase"))
+
 class ConversationManager:
     """
     Enhanced conversation manager that combines AI services with sophisticated prompt engineering
@@ -35,8 +50,8 @@ class ConversationManager:
         self.product_service = product_service
         self.conversation_service = conversation_service
         
-        # Conversation state tracking
-        self.conversation_states = {}
+        # Conversation state tracking (LRU, bounded by MAX_TRACKED_CONVERSATIONS)
+        self.conversation_states: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         
         # Performance tracking
         self.conversation_metrics = {
@@ -93,17 +108,10 @@ class ConversationManager:
             conversation = await self.conversation_service.create_conversation(conversation_data)
             conversation_id = conversation.conversation_id
             
-            # Generate welcome prompt
-            welcome_prompt = self.prompt_engine.generate_welcome_prompt(
-                branch=branch,
-                products=products,
-                customer_context=initial_context,
-                interaction_type=interaction_type
-            )
-            
             # Generate AI welcome response
             welcome_message = await self.ai_service.generate_conversation_response(
                 conversation_context={
+                    "conversation_id": conversation_id,
                     "branch": branch.value,
                     "products": [p.dict() for p in products],
                     "customer_context": initial_context,
@@ -126,13 +134,13 @@ class ConversationManager:
             )
             
             # Initialize conversation state
-            self.conversation_states[conversation_id] = {
+            self._store_conversation_state(conversation_id, {
                 "status": ConversationStatus.ACTIVE,
                 "message_count": 1,
                 "products_discussed": [p.product_id for p in products],
                 "customer_interest_level": "initial",
                 "last_interaction": datetime.utcnow()
-            }
+            })
             
             self.conversation_metrics["total_conversations"] += 1
             
@@ -155,32 +163,36 @@ class ConversationManager:
         try:
             logger.info(f"Processing message for conversation {conversation_id}")
             
-            # Get conversation context
-            conversation = await self.conversation_service.get_conversation(conversation_id)
+            # Get conversation context and history; the two reads are independent
+            conversation, history = await asyncio.gather(
+                self.conversation_service.get_conversation(conversation_id),
+                self.conversation_service.get_conversation_history(conversation_id)
+            )
             if not conversation:
                 logger.error(f"Conversation {conversation_id} not found")
                 return "I'm sorry, I couldn't find our conversation. Could you please start over?", ConversationStatus.ACTIVE
             
-            # Get conversation history
-            history = await self.conversation_service.get_conversation_history(conversation_id)
-            
-            # Store customer message
-            await self.conversation_service.add_message(
-                conversation_id=conversation_id,
-                sender=MessageSender.CUSTOMER,
-                content=customer_message,
-                metadata={"timestamp": datetime.utcnow().isoformat()}
+            # One clock read stamps everything recorded for this turn
+            now = datetime.utcnow()
+            
+            # Store the customer message while its sentiment and intent are
+            # analyzed; the analysis only reads the history fetched above
+            _, customer_analysis = await asyncio.gather(
+                self.conversation_service.add_message(
+                    conversation_id=conversation_id,
+                    sender=MessageSender.CUSTOMER,
+                    content=customer_message,
+                    metadata={"timestamp": now.isoformat()}
+                ),
+                self._analyze_customer_message(customer_message, history)
             )
             
-            # Analyze customer sentiment and intent
-            customer_analysis = await self._analyze_customer_message(customer_message, history)
-            
             # Update conversation state
             current_state = self.conversation_states.get(conversation_id, {})
             current_state.update({
                 "message_count": current_state.get("message_count", 0) + 1,
                 "customer_interest_level": customer_analysis["interest_level"],
-                "last_interaction": datetime.utcnow()
+                "last_interaction": now
             })
             
             # Determine conversation status and strategy
@@ -218,7 +230,7 @@ class ConversationManager:
             )
             
             # Update conversation state
-            self.conversation_states[conversation_id] = current_state
+            self._store_conversation_state(conversation_id, current_state)
             
             # Check if conversation should conclude
             if self._should_conclude_conversation(current_state, customer_analysis):
@@ -307,23 +319,16 @@ Provide analysis in JSON format:
         """Fallback message analysis when AI analysis fails"""
         message_lower = message.lower()
         
-        # Simple keyword-based analysis
-        negative_keywords = ["no", "not interested", "don't want", "too expensive", "bye", "goodbye"]
-        positive_keywords = ["yes", "interested", "tell me more", "how much", "buy", "purchase"]
-        question_keywords = ["what", "how", "when", "where", "which", "?"]
-        
-        if any(word in message_lower for word in negative_keywords):
+        # Simple keyword-based analysis; questions and everything else are
+        # both treated as information requests
+        if NEGATIVE_PATTERN.search(message_lower):
             interest_level = "declining"
             sentiment = "negative"
             intent = "objection"
-        elif any(word in message_lower for word in positive_keywords):
+        elif POSITIVE_PATTERN.search(message_lower):
             interest_level = "high"
             sentiment = "positive"
             intent = "purchase"
-        elif any(word in message_lower for word in question_keywords):
-            interest_level = "medium"
-            sentiment = "neutral"
-            intent = "information"
         else:
             interest_level = "medium"
             sentiment = "neutral"
@@ -397,19 +402,10 @@ Provide analysis in JSON format:
         try:
             branch = ConversationBranch(conversation.get("branch", "convincer"))
             
-            # Generate conversation prompt
-            conversation_prompt = self.prompt_engine.generate_conversation_prompt(
-                branch=branch,
-                customer_message=customer_message,
-                products=products,
-                conversation_history=[msg.dict() for msg in history[-5:]],  # Last 5 messages
-                customer_context=customer_context or {},
-                conversation_status=status
-            )
-            
             # Generate AI response
             response = await self.ai_service.generate_conversation_response(
                 conversation_context={
+                    "conversation_id": conversation.get("conversation_id"),
                     "branch": branch.value,
                     "products": [p.dict() for p in products],
                     "conversation_history": [msg.dict() for msg in history[-5:]],
@@ -444,18 +440,9 @@ Provide analysis in JSON format:
                     conversation, customer_message, alternative_products, history
                 )
             
-            # Generate recovery prompt
-            recovery_prompt = self.prompt_engine.generate_conversation_prompt(
-                branch=ConversationBranch(conversation.get("branch", "convincer")),
-                customer_message=customer_message,
-                products=products,
-                conversation_history=[msg.dict() for msg in history[-3:]],
-                customer_context=customer_context or {},
-                conversation_status=ConversationStatus.UNINTERESTED
-            )
-            
             response = await self.ai_service.generate_conversation_response(
                 conversation_context={
+                    "conversation_id": conversation.get("conversation_id"),
                     "branch": conversation.get("branch", "convincer"),
                     "products": [p.dict() for p in products],
                     "conversation_history": [msg.dict() for msg in history[-3:]],
@@ -482,15 +469,9 @@ Provide analysis in JSON format:
         try:
             original_products = await self._get_original_products(conversation)
             
-            cross_product_prompt = self.prompt_engine.generate_cross_product_recommendation_prompt(
-                original_products=original_products,
-                alternative_products=alternative_products,
-                customer_message=customer_message,
-                conversation_history=[msg.dict() for msg in history[-3:]]
-            )
-            
             response = await self.ai_service.generate_conversation_response(
                 conversation_context={
+                    "conversation_id": conversation.get("conversation_id"),
                     "branch": conversation.get("branch", "convincer"),
                     "original_products": [p.dict() for p in original_products],
                     "alternative_products": [p.dict() for p in alternative_products],
@@ -507,6 +488,13 @@ Provide analysis in JSON format:
             logger.error(f"Error handling cross-product recommendation: {e}")
             return "Based on what you've mentioned, you might be interested in some of our other products that could be a better fit for your needs."
     
+    def _store_conversation_state(self, conversation_id: str, state: Dict[str, Any]):
+        """Record a conversation's state, evicting the least recently active conversation when full"""
+        self.conversation_states[conversation_id] = state
+        self.conversation_states.move_to_end(conversation_id)
+        while len(self.conversation_states) > MAX_TRACKED_CONVERSATIONS:
+            self.conversation_states.popitem(last=False)
+    
     async def _get_alternative_products(self, current_products: List[Product]) -> List[Product]:
         """Get alternative products for cross-recommendations"""
         try:
@@ -579,16 +567,10 @@ Provide analysis in JSON format:
             # Get conversation history for context
             history = await self.conversation_service.get_conversation_history(conversation_id)
             
-            # Generate conclusion prompt
-            conclusion_prompt = self.prompt_engine.generate_conclusion_prompt(
-                conversation_history=[msg.dict() for msg in history[-5:]],
-                final_status=final_status,
-                products_discussed=products_discussed
-            )
-            
             # Generate conclusion message
             conclusion_message = await self.ai_service.generate_conversation_response(
                 conversation_context={
+                    "conversation_id": conversation_id,
                     "final_status": final_status.value,
                     "products_discussed": [p.dict() for p in products_discussed],
                     "conversation_history": [msg.dict() for msg in history[-3:]],
@@ -23,18 +23,7 @@ class ConversationService:
             conversation_id = str(uuid.uuid4())
             now = datetime.utcnow()
             
-            conversation_doc = {
-                "_id": conversation_id,
-                "conversation_id": conversation_id,
-                "customer_id": conversation_data.customer_id,
-                "business_id": conversation_data.business_id,
-                "product_context": conversation_data.product_context,
-                "conversation_branch": conversation_data.conversation_branch.value,
-                "messages": [],
-                "status": ConversationStatus.ACTIVE.value,
-                "created_at": now,
-                "updated_at": now
-            }
+            conversation_doc = self._new_conversation_doc(conversation_id, conversation_data, now)
             
             await self.collection.insert_one(conversation_doc)
             
@@ -54,6 +43,37 @@ class ConversationService:
             logger.error(f"Failed to create conversation: {e}")
             raise
     
+    async def create_conversation_with_messages(
+        self,
+        conversation_data: ConversationCreate,
+        messages: List[ConversationMessage]
+    ) -> Conversation:
+        """Create a conversation that already holds its messages, in a single insert"""
+        try:
+            conversation_id = str(uuid.uuid4())
+            now = datetime.utcnow()
+            
+            conversation_doc = self._new_conversation_doc(conversation_id, conversation_data, now)
+            conversation_doc["messages"] = [self._message_doc(message) for message in messages]
+            
+            await self.collection.insert_one(conversation_doc)
+            
+            return Conversation(
+                conversation_id=conversation_id,
+                customer_id=conversation_data.customer_id,
+                business_id=conversation_data.business_id,
+                product_context=conversation_data.product_context,
+                conversation_branch=conversation_data.conversation_branch,
+                messages=messages,
+                status=ConversationStatus.ACTIVE,
+                created_at=now,
+                updated_at=now
+            )
+            
+        except Exception as e:
+            logger.error(f"Failed to create conversation with messages: {e}")
+            raise
+    
     async def get_conversation_by_id(self, conversation_id: str) -> Optional[Conversation]:
         """Get a conversation by ID"""
         try:
@@ -69,13 +89,7 @@ class ConversationService:
     async def add_message(self, conversation_id: str, message: ConversationMessage) -> bool:
         """Add a message to an existing conversation"""
         try:
-            message_doc = {
-                "timestamp": message.timestamp,
-                "sender": message.sender.value,
-                "content": message.content,
-                "intent": message.intent,
-                "sentiment": message.sentiment
-            }
+            message_doc = self._message_doc(message)
             
             result = await self.collection.update_one(
                 {"_id": conversation_id},
@@ -154,6 +168,31 @@ class ConversationService:
             logger.error(f"Failed to get active conversations for customer {customer_id}: {e}")
             raise
     
+    def _new_conversation_doc(self, conversation_id: str, conversation_data: ConversationCreate, now: datetime) -> Dict[str, Any]:
+        """Build the MongoDB document for a new, empty conversation"""
+        return {
+            "_id": conversation_id,
+            "conversation_id": conversation_id,
+            "customer_id": conversation_data.customer_id,
+            "business_id": conversation_data.business_id,
+            "product_context": conversation_data.product_context,
+            "conversation_branch": conversation_data.conversation_branch.value,
+            "messages": [],
+            "status": ConversationStatus.ACTIVE.value,
+            "created_at": now,
+            "updated_at": now
+        }
+    
+    def _message_doc(self, message: ConversationMessage) -> Dict[str, Any]:
+        """Build the MongoDB subdocument for a conversation message"""
+        return {
+            "timestamp": message.timestamp,
+            "sender": message.sender.value,
+            "content": message.content,
+            "intent": message.intent,
+            "sentiment": message.sentiment
+        }
+    
     def _doc_to_pydantic(self, doc: Dict[str, Any]) -> Conversation:
         """Convert MongoDB document to Pydantic model"""
         messages = []
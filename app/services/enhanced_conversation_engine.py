@@ -9,12 +9,14 @@ from app.services.prompt_engine import PromptEngine
 from app.services.conversation_manager import ConversationManager
 from app.services.product_service import ProductService
 from app.services.conversation_service import ConversationService
+from app.services.response_cache import ResponseCache, response_cache as shared_response_cache
 from app.models.schemas import (
     ConversationMessage, MessageSender, ConversationStatus,
-    ConversationContext, Product, ConversationBranch
+    ConversationBranch
 )
 from datetime import datetime
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -28,12 +30,19 @@ class EnhancedConversationEngine:
         self,
         ai_service: AzureOpenAIService,
         product_service: ProductService,
-        conversation_service: ConversationService
+        conversation_service: ConversationService,
+        response_cache: Optional[ResponseCache] = None
     ):
         self.ai_service = ai_service
         self.product_service = product_service
         self.conversation_service = conversation_service
         
+        # Serve repeated keyword extractions from the process-wide cache
+        # instead of another LLM round trip; conversation replies bypass it
+        self.response_cache = response_cache or shared_response_cache
+        if getattr(ai_service, "response_cache", None) is None:
+            ai_service.response_cache = self.response_cache
+        
         # Initialize Step 6 components
         self.prompt_engine = PromptEngine()
         self.conversation_manager = ConversationManager(
@@ -63,6 +72,7 @@ class EnhancedConversationEngine:
         """
         try:
             start_time = datetime.utcnow()
+            started = time.perf_counter()
             self.engine_metrics["total_interactions"] += 1
             
             logger.info(f"Starting Manipulator conversation for customer {customer_id}")
@@ -107,7 +117,7 @@ class EnhancedConversationEngine:
                 }
             
             # Calculate response time
-            response_time = (datetime.utcnow() - start_time).total_seconds()
+            response_time = time.perf_counter() - started
             self._update_success_metrics(response_time)
             
             logger.info(f"Manipulator conversation {conversation_id} started successfully")
@@ -147,6 +157,7 @@ class EnhancedConversationEngine:
         """
         try:
             start_time = datetime.utcnow()
+            started = time.perf_counter()
             self.engine_metrics["total_interactions"] += 1
             
             logger.info(f"Starting Convincer conversation for customer {customer_id}")
@@ -184,7 +195,7 @@ class EnhancedConversationEngine:
             )
             
             # Calculate response time
-            response_time = (datetime.utcnow() - start_time).total_seconds()
+            response_time = time.perf_counter() - started
             self._update_success_metrics(response_time)
             
             logger.info(f"Convincer conversation {conversation_id} started successfully")
@@ -221,7 +232,7 @@ class EnhancedConversationEngine:
         Continue an existing conversation with enhanced conversation management
         """
         try:
-            start_time = datetime.utcnow()
+            started = time.perf_counter()
             
             logger.info(f"Continuing conversation {conversation_id}")
             
@@ -236,7 +247,7 @@ class EnhancedConversationEngine:
             metrics = self.conversation_manager.get_conversation_metrics()
             
             # Calculate response time
-            response_time = (datetime.utcnow() - start_time).total_seconds()
+            response_time = time.perf_counter() - started
             self._update_success_metrics(response_time)
             
             return {
@@ -311,6 +322,7 @@ class EnhancedConversationEngine:
                 "engine_metrics": self.engine_metrics,
                 "conversation_metrics": manager_metrics,
                 "prompt_statistics": prompt_stats,
+                "response_cache": self.response_cache.get_statistics(),
                 "active_conversations": self.conversation_manager.get_active_conversations_count(),
                 "system_health": {
                     "ai_service": "operational",
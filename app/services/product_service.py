@@ -1,13 +1,22 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from collections import OrderedDict
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, or_
 from app.models.database import ProductModel
-from app.models.schemas import Product, ProductCreate, ProductAttributes
+from app.models.schemas import Product, ProductCreate
 import uuid
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Products looked up by ID, shared by every ProductService. A conversation
+# re-reads its ad's product on each turn, and products are never updated in
+# place, so a short TTL skips most of those round-trips without going stale
+PRODUCT_CACHE_SIZE = 5000
+PRODUCT_CACHE_TTL_SECONDS = 5.0
+_product_cache: "OrderedDict[str, Tuple[float, Product]]" = OrderedDict()
+
 class ProductService:
     """Service class for product-related database operations"""
     
@@ -40,12 +49,24 @@ class ProductService:
     async def get_product_by_id(self, product_id: str) -> Optional[Product]:
         """Get a product by its ID"""
         try:
+            entry = _product_cache.get(product_id)
+            if entry is not None:
+                stored_at, product = entry
+                if time.monotonic() - stored_at <= PRODUCT_CACHE_TTL_SECONDS:
+                    _product_cache.move_to_end(product_id)
+                    return product
+                del _product_cache[product_id]
+            
             query = select(ProductModel).where(ProductModel.id == uuid.UUID(product_id))
             result = await self.session.execute(query)
             db_product = result.scalar_one_or_none()
             
             if db_product:
-                return self._to_pydantic(db_product)
+                product = self._to_pydantic(db_product)
+                _product_cache[product_id] = (time.monotonic(), product)
+                if len(_product_cache) > PRODUCT_CACHE_SIZE:
+                    _product_cache.popitem(last=False)
+                return product
             return None
             
         except Exception as e:
@@ -97,6 +118,69 @@ class ProductService:
             logger.error(f"Failed to get all products: {e}")
             raise
             
+    async def search_products_by_tags(self, keywords: List[str], threshold: float = 0.8) -> List[Dict[str, Any]]:
+        """
+        Score every product against the keywords and return matches above the threshold.
+        This is the tagMatcher step of the pipeline.
+        """
+        try:
+            if not keywords:
+                return []
+            
+            # Scoring only needs the tag sources, so fetch just those columns for
+            # every product and load full rows only for the products that match
+            query = select(ProductModel.id, ProductModel.category, ProductModel.product_metadata)
+            result = await self.session.execute(query)
+            
+            # Lowercase the query once instead of once per product
+            keywords_lower = {word.lower() for word in keywords}
+            
+            scores = {}
+            for row in result:
+                score = self._score_tag_set(keywords_lower, self._product_tag_set(row))
+                if score >= threshold:
+                    scores[row.id] = score
+            
+            if not scores:
+                return []
+            
+            result = await self.session.execute(
+                select(ProductModel).where(ProductModel.id.in_(list(scores)))
+            )
+            matches = [
+                {
+                    "product_id": str(db_product.id),
+                    "score": scores[db_product.id],
+                    "product": self._to_pydantic(db_product)
+                }
+                for db_product in result.scalars()
+            ]
+            
+            matches.sort(key=lambda match: match["score"], reverse=True)
+            return matches
+            
+        except Exception as e:
+            logger.error(f"Failed to search products by tags {keywords}: {e}")
+            raise
+    
+    def _product_tag_set(self, db_product) -> set:
+        """Collect the lowercased tags of a product (model or row) from its metadata and category"""
+        tags = set()
+        metadata = db_product.product_metadata or {}
+        for tag in metadata.get("tags", []) or []:
+            if isinstance(tag, str):
+                tags.add(tag.lower())
+        if db_product.category:
+            tags.add(db_product.category.lower())
+        return tags
+    
+    def _score_tag_set(self, keywords_lower: set, tags_lower: set) -> float:
+        """Jaccard similarity between two already-lowercased sets"""
+        if not keywords_lower or not tags_lower:
+            return 0.0
+        
+        return len(keywords_lower & tags_lower) / len(keywords_lower | tags_lower)
+    
     def _calculate_tag_similarity(self, keywords: List[str], product_tags: List[str]) -> float:
         """
         Calculate similarity score between keywords and product tags
@@ -109,14 +193,7 @@ class ProductService:
         keywords_lower = set(word.lower() for word in keywords)
         tags_lower = set(tag.lower() for tag in product_tags)
         
-        # Calculate Jaccard similarity
-        intersection = keywords_lower.intersection(tags_lower)
-        union = keywords_lower.union(tags_lower)
-        
-        if not union:
-            return 0.0
-        
-        return len(intersection) / len(union)
+        return self._score_tag_set(keywords_lower, tags_lower)
     
     def _to_pydantic(self, db_product: ProductModel) -> Product:
         """Convert SQLAlchemy model to Pydantic model"""
@@ -3,19 +3,130 @@ Prompt Engineering Service for ManipulatorAI
 Handles sophisticated conversation prompts, welcome protocols, and persuasion strategies
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any
 from app.models.schemas import ConversationBranch, ConversationStatus, Product
-from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Static instructions for welcome and conversation prompts. They open every
+# prompt, with the products, history and the customer's message following
+# CONVERSATION_MARKER.
+CONVERSATION_MARKER = "\n<conversation>\n"
+
+MANIPULATOR_WELCOME_INSTRUCTIONS = """TASK: Create a warm, welcoming response that acknowledges their interest and naturally introduces them to our products.
+
+WELCOME PROTOCOL STRATEGY:
+1. **Warm Greeting**: Thank them for their interest in a genuine way
+2. **Interest Acknowledgment**: Reference their specific interaction naturally
+3. **Value Introduction**: Briefly highlight what makes our products special
+4. **Helpful Positioning**: Position yourself as a helpful advisor, not a salesperson
+5. **Engaging Question**: End with a question that encourages them to share their needs
+
+CONVERSATION GUIDELINES:
+- Be genuinely enthusiastic but not overly eager
+- Focus on being helpful rather than selling
+- Use conversational, friendly language
+- Keep the welcome message under 80 words
+- Make them feel valued as a potential customer"""
+
+CONVINCER_WELCOME_INSTRUCTIONS = """CUSTOMER CONTACT: The customer has reached out to us directly via message.
+
+TASK: Create a welcoming response that makes them feel heard and introduces our ability to help them.
+
+WELCOME PROTOCOL STRATEGY:
+1. **Warm Greeting**: Professional but friendly welcome
+2. **Appreciation**: Thank them for reaching out
+3. **Expertise Positioning**: Subtly establish your product knowledge
+4. **Needs Discovery**: Show interest in understanding their specific needs
+5. **Support Offering**: Clearly offer assistance in finding the right solution
+
+CONVERSATION GUIDELINES:
+- Be professional yet approachable
+- Show genuine interest in helping them
+- Demonstrate product expertise without overwhelming
+- Keep response under 75 words
+- End with an invitation for them to share their needs"""
+
+MANIPULATOR_INSTRUCTIONS = """TASK: Respond as a knowledgeable product consultant who understands this customer came from our advertising.
+
+MANIPULATOR BRANCH STRATEGY:
+1. **Direct Relevance**: Address their message in context of the advertised products
+2. **Product Focus**: Keep conversation centered on the specific products they showed interest in
+3. **Benefits Highlighting**: Emphasize unique value propositions
+4. **Urgency Creation**: Subtly create appropriate urgency without being pushy
+5. **Next Steps**: Guide them toward making a decision or getting more information
+
+PERSUASION TECHNIQUES:
+- Use social proof when relevant ("Many customers love...")
+- Highlight scarcity or exclusivity appropriately
+- Focus on benefits that solve their problems
+- Create emotional connection to the products
+- Provide clear next steps
+
+RESPONSE GUIDELINES:
+- Stay focused on the advertised products
+- Be persuasive but not aggressive
+- Keep response under 90 words
+- Include a clear call-to-action
+- Maintain helpful, expert tone"""
+
+CONVINCER_INSTRUCTIONS = """TASK: Respond as a helpful product expert who can guide them to the perfect solution.
+
+CONVINCER BRANCH STRATEGY:
+1. **Active Listening**: Show you understand their specific needs and concerns
+2. **Consultative Approach**: Ask thoughtful questions to better understand requirements
+3. **Tailored Recommendations**: Match products specifically to their expressed needs
+4. **Education Focus**: Provide valuable information that helps them make informed decisions
+5. **Relationship Building**: Focus on long-term customer satisfaction over quick sales
+
+CONVERSATION TECHNIQUES:
+- Ask clarifying questions about their preferences
+- Provide detailed product knowledge when relevant
+- Address concerns with factual information
+- Suggest alternatives if initial products don't fit
+- Build trust through expertise and honesty
+
+RESPONSE GUIDELINES:
+- Address their specific message directly
+- Be helpful and informative
+- Keep response under 85 words
+- End with a helpful question or suggestion
+- Maintain consultative, expert tone"""
+
+RECOVERY_INSTRUCTIONS = """SITUATION: The customer has shown signs of disinterest or is about to disengage.
+
+TASK: Create a recovery response that respects their position while keeping the door open.
+
+RECOVERY STRATEGY:
+1. **Acknowledge Understanding**: Show that you respect their current position
+2. **No Pressure**: Explicitly remove any sales pressure
+3. **Value Offering**: Offer something genuinely useful (information, future help)
+4. **Relationship Focus**: Prioritize relationship over immediate sale
+5. **Graceful Exit**: Provide an easy way for them to disengage if they prefer
+
+RECOVERY TECHNIQUES:
+- Use empathetic language ("I understand...")
+- Offer future assistance without commitment
+- Provide useful information regardless of purchase intent
+- Show respect for their time and decision-making process
+- Leave a positive final impression
+
+RESPONSE GUIDELINES:
+- Be gracious and understanding
+- Remove all sales pressure
+- Keep response under 70 words
+- Offer genuine value or future help
+- End on a positive, respectful note"""
+
 class PromptEngine:
     """
     Advanced prompt engineering service that creates sophisticated conversation prompts
     for both Manipulator and Convincer branches with persuasive strategies
     """
     
+    __slots__ = ("business_personality",)
+    
     def __init__(self):
         self.business_personality = {
             "tone": "friendly_professional",
@@ -162,7 +273,7 @@ Generate a natural, helpful response that smoothly introduces the alternative pr
             elif hasattr(product, 'category') and product.category:
                 categories.add(product.category)
         
-        category_text = ", ".join(categories) if categories else "various categories"
+        category_text = ", ".join(sorted(categories)) if categories else "various categories"
         
         return f"""BUSINESS CONTEXT:
 We are a premium retailer specializing in {category_text}. Our mission is to help customers find products that perfectly match their needs and preferences. We pride ourselves on quality, customer service, and building long-term relationships.
@@ -217,7 +328,6 @@ AVAILABLE PRODUCTS:
         for msg in conversation_history[-5:]:  # Last 5 messages for context
             sender = msg.get('sender', 'unknown')
             content = msg.get('content', '')[:100]  # Truncate long messages
-            timestamp = msg.get('timestamp', 'recent')
             history_lines.append(f"[{sender}]: {content}")
         
         return "RECENT CONVERSATION:\n" + "\n".join(history_lines)
@@ -231,151 +341,46 @@ AVAILABLE PRODUCTS:
             'share': 'shared our content'
         }.get(interaction_type, 'interacted with our content')
         
-        return f"""{base_context}
+        return f"""{MANIPULATOR_WELCOME_INSTRUCTIONS}{CONVERSATION_MARKER}{base_context}
 
 CUSTOMER INTERACTION: The customer just {interaction_context} about our products.
 
-TASK: Create a warm, welcoming response that acknowledges their interest and naturally introduces them to our products.
-
-WELCOME PROTOCOL STRATEGY:
-1. **Warm Greeting**: Thank them for their interest in a genuine way
-2. **Interest Acknowledgment**: Reference their specific interaction naturally
-3. **Value Introduction**: Briefly highlight what makes our products special
-4. **Helpful Positioning**: Position yourself as a helpful advisor, not a salesperson
-5. **Engaging Question**: End with a question that encourages them to share their needs
-
-CONVERSATION GUIDELINES:
-- Be genuinely enthusiastic but not overly eager
-- Focus on being helpful rather than selling
-- Use conversational, friendly language
-- Keep the welcome message under 80 words
-- Make them feel valued as a potential customer
-
 Generate a warm welcome message that feels personal and engaging:"""
     
     def _create_convincer_welcome(self, products: List[Product], customer_context: Dict[str, Any], base_context: str) -> str:
         """Create welcome prompt for Convincer branch (direct messages)"""
-        return f"""{base_context}
-
-CUSTOMER CONTACT: The customer has reached out to us directly via message.
-
-TASK: Create a welcoming response that makes them feel heard and introduces our ability to help them.
-
-WELCOME PROTOCOL STRATEGY:
-1. **Warm Greeting**: Professional but friendly welcome
-2. **Appreciation**: Thank them for reaching out
-3. **Expertise Positioning**: Subtly establish your product knowledge
-4. **Needs Discovery**: Show interest in understanding their specific needs
-5. **Support Offering**: Clearly offer assistance in finding the right solution
-
-CONVERSATION GUIDELINES:
-- Be professional yet approachable
-- Show genuine interest in helping them
-- Demonstrate product expertise without overwhelming
-- Keep response under 75 words
-- End with an invitation for them to share their needs
+        return f"""{CONVINCER_WELCOME_INSTRUCTIONS}{CONVERSATION_MARKER}{base_context}
 
 Generate a professional welcome that establishes trust and helpfulness:"""
     
     def _create_manipulator_prompt(self, customer_message: str, products: List[Product], history_context: str, base_context: str) -> str:
         """Create conversation prompt for Manipulator branch"""
-        return f"""{base_context}
+        return f"""{MANIPULATOR_INSTRUCTIONS}{CONVERSATION_MARKER}{base_context}
 
 {history_context}
 
 CUSTOMER'S MESSAGE: "{customer_message}"
 
-TASK: Respond as a knowledgeable product consultant who understands this customer came from our advertising.
-
-MANIPULATOR BRANCH STRATEGY:
-1. **Direct Relevance**: Address their message in context of the advertised products
-2. **Product Focus**: Keep conversation centered on the specific products they showed interest in
-3. **Benefits Highlighting**: Emphasize unique value propositions
-4. **Urgency Creation**: Subtly create appropriate urgency without being pushy
-5. **Next Steps**: Guide them toward making a decision or getting more information
-
-PERSUASION TECHNIQUES:
-- Use social proof when relevant ("Many customers love...")
-- Highlight scarcity or exclusivity appropriately
-- Focus on benefits that solve their problems
-- Create emotional connection to the products
-- Provide clear next steps
-
-RESPONSE GUIDELINES:
-- Stay focused on the advertised products
-- Be persuasive but not aggressive
-- Keep response under 90 words
-- Include a clear call-to-action
-- Maintain helpful, expert tone
-
 Generate a focused response that moves the conversation toward a decision:"""
     
     def _create_convincer_prompt(self, customer_message: str, products: List[Product], history_context: str, base_context: str, customer_context: Dict[str, Any]) -> str:
         """Create conversation prompt for Convincer branch"""
-        return f"""{base_context}
+        return f"""{CONVINCER_INSTRUCTIONS}{CONVERSATION_MARKER}{base_context}
 
 {history_context}
 
 CUSTOMER'S MESSAGE: "{customer_message}"
 
-TASK: Respond as a helpful product expert who can guide them to the perfect solution.
-
-CONVINCER BRANCH STRATEGY:
-1. **Active Listening**: Show you understand their specific needs and concerns
-2. **Consultative Approach**: Ask thoughtful questions to better understand requirements
-3. **Tailored Recommendations**: Match products specifically to their expressed needs
-4. **Education Focus**: Provide valuable information that helps them make informed decisions
-5. **Relationship Building**: Focus on long-term customer satisfaction over quick sales
-
-CONVERSATION TECHNIQUES:
-- Ask clarifying questions about their preferences
-- Provide detailed product knowledge when relevant
-- Address concerns with factual information
-- Suggest alternatives if initial products don't fit
-- Build trust through expertise and honesty
-
-RESPONSE GUIDELINES:
-- Address their specific message directly
-- Be helpful and informative
-- Keep response under 85 words
-- End with a helpful question or suggestion
-- Maintain consultative, expert tone
-
 Generate a helpful response that demonstrates expertise and builds trust:"""
     
     def _create_recovery_prompt(self, customer_message: str, products: List[Product], history_context: str, base_context: str) -> str:
         """Create recovery prompt for uninterested customers"""
-        return f"""{base_context}
+        return f"""{RECOVERY_INSTRUCTIONS}{CONVERSATION_MARKER}{base_context}
 
 {history_context}
 
 CUSTOMER'S MESSAGE: "{customer_message}"
 
-SITUATION: The customer has shown signs of disinterest or is about to disengage.
-
-TASK: Create a recovery response that respects their position while keeping the door open.
-
-RECOVERY STRATEGY:
-1. **Acknowledge Understanding**: Show that you respect their current position
-2. **No Pressure**: Explicitly remove any sales pressure
-3. **Value Offering**: Offer something genuinely useful (information, future help)
-4. **Relationship Focus**: Prioritize relationship over immediate sale
-5. **Graceful Exit**: Provide an easy way for them to disengage if they prefer
-
-RECOVERY TECHNIQUES:
-- Use empathetic language ("I understand...")
-- Offer future assistance without commitment
-- Provide useful information regardless of purchase intent
-- Show respect for their time and decision-making process
-- Leave a positive final impression
-
-RESPONSE GUIDELINES:
-- Be gracious and understanding
-- Remove all sales pressure
-- Keep response under 70 words
-- Offer genuine value or future help
-- End on a positive, respectful note
-
 Generate a graceful response that prioritizes relationship over immediate sales:"""
     
     def _create_qualified_conclusion(self, history_context: str, products_discussed: List[Product]) -> str:
@@ -0,0 +1,83 @@
+"""
+Response cache for ManipulatorAI
+Reuses Azure OpenAI completions for repeated or near-duplicate prompts
+"""
+
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
+import re
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_prompt(text: str) -> str:
+    """Fold case and collapse whitespace so trivially different prompts share a key"""
+    return _WHITESPACE.sub(" ", text).strip().casefold()
+
+class ResponseCache:
+    """
+    Bounded LRU cache of completions keyed by the normalized chat messages
+    and the sampling parameters they were generated with
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl_seconds: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(messages: List[Dict[str, str]], max_tokens: int, temperature: float) -> Tuple:
+        """Build the cache key for a completion request"""
+        return (
+            tuple((m.get("role", ""), normalize_prompt(m.get("content", ""))) for m in messages),
+            max_tokens,
+            temperature
+        )
+
+    def lookup(self, key: Tuple) -> Optional[str]:
+        """Return the cached completion for key, or None on a miss or expired entry"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, response = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response
+
+    def put(self, key: Tuple, response: str):
+        """Store a completion, evicting the least recently used entry when full"""
+        self._entries[key] = (time.monotonic(), response)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached completion"""
+        self._entries.clear()
+
+    def get_statistics(self) -> Dict[str, float]:
+        """Return cache size and hit rate"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+# Shared by every engine in the process; engines are created per task,
+# so a per-instance cache would never see a repeated prompt
+response_cache = ResponseCache()
@@ -4,20 +4,17 @@ Coordinates and monitors asynchronous task processing
 """
 
 from typing import Dict, Any, Optional, List
-from celery import Celery
 from celery.result import AsyncResult
 from app.core.celery_app import celery_app
 from app.tasks.conversation_tasks import (
     process_conversation_message_task,
     process_manipulator_interaction_task,
-    continue_conversation_async_task,
-    batch_conversation_analysis_task
+    continue_conversation_async_task
 )
 from app.tasks.webhook_tasks import (
     process_facebook_webhook_task,
     process_google_webhook_task,
-    process_generic_webhook_task,
-    send_webhook_response_task
+    process_generic_webhook_task
 )
 from app.tasks.analytics_tasks import (
     generate_conversation_analytics_task,
@@ -158,12 +155,13 @@ class TaskManager:
         """
         try:
             # Choose appropriate webhook processor based on platform
-            if platform.lower() == "facebook":
+            platform_key = platform.lower()
+            if platform_key == "facebook":
                 task = process_facebook_webhook_task.apply_async(
                     args=[webhook_data],
                     queue=self._get_queue_for_priority(priority)
                 )
-            elif platform.lower() == "google":
+            elif platform_key == "google":
                 task = process_google_webhook_task.apply_async(
                     args=[webhook_data],
                     queue=self._get_queue_for_priority(priority)
@@ -259,22 +257,27 @@ class TaskManager:
         Get the status of a specific task
         """
         try:
-            result = AsyncResult(task_id, app=self.celery_app)
+            # Every AsyncResult property re-reads the result backend until the
+            # task finishes, so fetch the task meta once and derive fields from it
+            meta = self.celery_app.backend.get_task_meta(task_id)
+            state = meta["status"]
+            task_result = meta.get("result")
+            task_metadata = self.active_tasks.get(task_id, {})
             
             status_info = {
                 "task_id": task_id,
-                "status": result.state,
-                "result": result.result if result.successful() else None,
-                "info": result.info if result.state == "PENDING" else result.result,
-                "traceback": result.traceback if result.failed() else None,
-                "created_at": self.active_tasks.get(task_id, {}).get("created_at"),
-                "task_metadata": self.active_tasks.get(task_id, {})
+                "status": state,
+                "result": task_result if state == "SUCCESS" else None,
+                "info": task_result,
+                "traceback": meta.get("traceback") if state == "FAILURE" else None,
+                "created_at": task_metadata.get("created_at"),
+                "task_metadata": task_metadata
             }
             
             # Add timing information if available
-            if result.successful() and hasattr(result.result, 'get'):
-                if isinstance(result.result, dict):
-                    status_info["completed_at"] = result.result.get("completed_at")
+            if state == "SUCCESS" and hasattr(task_result, 'get'):
+                if isinstance(task_result, dict):
+                    status_info["completed_at"] = task_result.get("completed_at")
                     status_info["duration"] = self._calculate_duration(
                         status_info.get("created_at"),
                         status_info.get("completed_at")
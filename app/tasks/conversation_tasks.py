@@ -194,7 +194,6 @@ def process_manipulator_interaction_task(
             ai_service = AzureOpenAIService()
             
             from app.core.database import async_session_maker, get_mongo_client
-            from app.core.config import settings
             
             async with async_session_maker() as postgres_session:
                 mongo_client = get_mongo_client()
@@ -317,7 +316,6 @@ def continue_conversation_async_task(
             ai_service = AzureOpenAIService()
             
             from app.core.database import async_session_maker, get_mongo_client
-            from app.core.config import settings
             
             async with async_session_maker() as postgres_session:
                 mongo_client = get_mongo_client()
@@ -402,7 +400,6 @@ def batch_conversation_analysis_task(self, conversation_ids: list):
         
         async def analyze_conversations():
             from app.core.database import async_session_maker, get_mongo_client
-            from app.core.config import settings
             
             async with async_session_maker() as postgres_session:
                 mongo_client = get_mongo_client()
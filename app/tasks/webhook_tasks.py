@@ -12,10 +12,38 @@ import asyncio
 import logging
 import json
 import httpx
+import weakref
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# One pooled client per event loop for outbound webhook responses. run_async_task
+# keeps reusing the worker's loop, so connections and TLS sessions to the same
+# platforms stay open across tasks instead of being set up for every response
+_webhook_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+def _shared_webhook_client() -> httpx.AsyncClient:
+    """Return the running loop's pooled client for sending webhook responses"""
+    loop = asyncio.get_running_loop()
+    client = _webhook_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=30.0
+        )
+        _webhook_clients[loop] = client
+    return client
+
+# Retry only network failures, with exponential backoff and random jitter so
+# responses that failed together do not all retry against the platform at once
+TRANSIENT_RETRY_OPTIONS = {
+    "autoretry_for": (httpx.TransportError,),
+    "retry_backoff": True,
+    "retry_backoff_max": 600,
+    "retry_jitter": True,
+    "retry_kwargs": {"max_retries": 3}
+}
+
 def run_async_task(coro):
     """Helper to run async functions in Celery tasks"""
     try:
@@ -284,14 +312,15 @@ def process_generic_webhook_task(self, webhook_data: Dict[str, Any], platform: s
             }
         )
         
-        # Extract standard fields from webhook data
+        # Extract standard fields from webhook data, reading the clock once
+        received_at = datetime.utcnow()
         interaction_data = {
-            "customer_id": webhook_data.get("customer_id", f"webhook_{datetime.utcnow().timestamp()}"),
+            "customer_id": webhook_data.get("customer_id", f"webhook_{received_at.timestamp()}"),
             "business_id": webhook_data.get("business_id", "default_business"),
             "product_id": webhook_data.get("product_id"),
             "type": webhook_data.get("interaction_type", "webhook"),
             "platform": platform,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": received_at.isoformat(),
             "raw_data": webhook_data
         }
         
@@ -341,7 +370,7 @@ def process_generic_webhook_task(self, webhook_data: Dict[str, Any], platform: s
         )
         raise
 
-@celery_app.task(bind=True, name="send_webhook_response")
+@celery_app.task(bind=True, name="send_webhook_response", **TRANSIENT_RETRY_OPTIONS)
 def send_webhook_response_task(self, webhook_url: str, response_data: Dict[str, Any]):
     """
     Asynchronously send response back to webhook source
@@ -360,17 +389,17 @@ def send_webhook_response_task(self, webhook_url: str, response_data: Dict[str,
         )
         
         async def send_response():
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    webhook_url,
-                    json=response_data,
-                    timeout=30.0
-                )
-                return {
-                    "status_code": response.status_code,
-                    "response_text": response.text,
-                    "success": response.status_code < 400
-                }
+            client = _shared_webhook_client()
+            response = await client.post(
+                webhook_url,
+                json=response_data,
+                timeout=30.0
+            )
+            return {
+                "status_code": response.status_code,
+                "response_text": response.text,
+                "success": response.status_code < 400
+            }
         
         # Send the webhook response
         result = run_async_task(send_response())
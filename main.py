@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 from app.core.database import db_manager
 from app.core.config import settings
@@ -20,6 +21,7 @@ async def lifespan(app: FastAPI):
     logger.info("Starting ManipulatorAI...")
     try:
         await db_manager.connect_postgresql()
+        await db_manager.warm_postgres_pool()
         await db_manager.connect_mongodb()
         await db_manager.connect_redis()
         logger.info("All database connections established")
@@ -38,7 +40,9 @@ app = FastAPI(
     title="ManipulatorAI",
     description="A microservice for intelligent customer engagement",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # Encode every response body with orjson instead of the stdlib json encoder
+    default_response_class=ORJSONResponse
 )
 
 # Include API routers
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Shared uvicorn fixture for the API test scripts
+Starts the application, waits until it answers /health and stops it afterwards
+"""
+
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).parent.parent
+HEALTH_URL = "/health"
+# Lines of uvicorn's output shown when the application fails to start
+STARTUP_LOG_TAIL = 30
+
+async def is_ready(base_url: str) -> bool:
+    """Check once whether an application is already answering at base_url"""
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=0.5) as client:
+            return (await client.get(HEALTH_URL)).status_code == 200
+    except httpx.TransportError:
+        return False
+
+def start_application(app_path: str, host: str, port: int, log_file) -> subprocess.Popen:
+    """Start uvicorn serving app_path in a child process, logging to log_file"""
+    cmd = [
+        sys.executable, "-m", "uvicorn",
+        app_path,
+        "--host", host,
+        "--port", str(port),
+        "--loop", "uvloop",
+        "--http", "httptools",
+        "--no-access-log"
+    ]
+
+    # The code does not change during a test run, so only pay for the
+    # reload supervisor and file watcher when explicitly asked to
+    if os.getenv("TEST_RELOAD"):
+        cmd.append("--reload")
+
+    # Write uvicorn's output to a file rather than a pipe nobody reads, so a
+    # full pipe buffer cannot block it mid-test and a failed startup can be shown
+    return subprocess.Popen(
+        cmd,
+        cwd=PROJECT_ROOT,
+        stdout=log_file,
+        stderr=subprocess.STDOUT
+    )
+
+def read_log_tail(log_file, lines: int = STARTUP_LOG_TAIL) -> str:
+    """Return the last lines written to the application's log file"""
+    log_file.seek(0)
+    output = log_file.read().decode(errors="replace").splitlines()
+    return "\n".join(output[-lines:])
+
+async def wait_until_ready(process: subprocess.Popen, base_url: str, deadline: float = 15.0) -> bool:
+    """Poll /health until the application answers or the deadline passes"""
+    delay = 0.1
+    give_up_at = time.monotonic() + deadline
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=0.5) as client:
+        while time.monotonic() < give_up_at:
+            if process.poll() is not None:
+                # uvicorn exited during startup
+                return False
+            try:
+                if (await client.get(HEALTH_URL)).status_code == 200:
+                    return True
+            except httpx.TransportError:
+                pass
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.4)
+
+    return False
+
+def stop_application(process: subprocess.Popen):
+    """Stop the uvicorn child process"""
+    print("🛑 Stopping application...")
+    # SIGINT lets uvicorn drain connections and close its listener cleanly,
+    # so the port can be rebound straight away on the next run
+    process.send_signal(signal.SIGINT)
+    try:
+        process.wait(timeout=5)
+        return
+    except subprocess.TimeoutExpired:
+        pass
+
+    process.terminate()
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+@asynccontextmanager
+async def running_app(port: int, app_path: str = "app.main_simple:app", host: str = "127.0.0.1"):
+    """
+    Yield the base URL of a freshly started application.
+    /health does not say which app is answering, so an application already
+    listening on the port is only reused when REUSE_RUNNING_APP is set.
+    """
+    base_url = f"http://{host}:{port}"
+
+    if await is_ready(base_url):
+        if not os.getenv("REUSE_RUNNING_APP"):
+            raise RuntimeError(
+                f"Another application is already answering at {base_url}; stop it, "
+                f"or set REUSE_RUNNING_APP=1 to test against it as {app_path}"
+            )
+        print(f"♻️  Reusing application already running at {base_url} (REUSE_RUNNING_APP)")
+        yield base_url
+        return
+
+    print(f"🚀 Starting {app_path} on port {port}...")
+    with tempfile.TemporaryFile() as log_file:
+        process = start_application(app_path, host, port, log_file)
+        try:
+            print("⏳ Waiting for application to start...")
+            if not await wait_until_ready(process, base_url):
+                print(f"📜 Application output:\n{read_log_tail(log_file)}")
+                raise RuntimeError(f"Application did not become ready at {base_url}")
+
+            yield base_url
+
+        finally:
+            stop_application(process)
@@ -8,6 +8,11 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.patches import FancyBboxPatch, ConnectionPatch
 import numpy as np
+from pathlib import Path
+
+# Diagrams are written to the repo's docs/ directory, resolved from this file
+# rather than a machine-specific absolute path
+DOCS_DIR = Path(__file__).resolve().parent.parent / "docs"
 
 def create_data_flow_diagram():
     """Create a comprehensive data flow diagram"""
@@ -325,16 +330,17 @@ Output: JSON response with next actions
 if __name__ == "__main__":
     # Create diagrams
     print("Creating ManipulatorAI data flow diagrams...")
+    DOCS_DIR.mkdir(exist_ok=True)
     
     # Main data flow diagram
     fig1 = create_data_flow_diagram()
-    fig1.savefig('/Users/Kazi/Desktop/Manipulator-Demo/docs/data_flow_architecture.png', 
+    fig1.savefig(DOCS_DIR / 'data_flow_architecture.png', 
                 dpi=300, bbox_inches='tight')
     print("✅ Created data_flow_architecture.png")
     
     # Conversation flow diagram
     fig2 = create_conversation_flow_diagram()
-    fig2.savefig('/Users/Kazi/Desktop/Manipulator-Demo/docs/conversation_flow_diagram.png', 
+    fig2.savefig(DOCS_DIR / 'conversation_flow_diagram.png', 
                 dpi=300, bbox_inches='tight')
     print("✅ Created conversation_flow_diagram.png")
     
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+API Test Runner
+Runs the API test scripts back to back on a single event loop
+"""
+
+import asyncio
+import sys
+
+import test_api_azure_integration
+import test_simplified_api
+
+SUITES = [
+    ("Simplified API", test_simplified_api.main),
+    ("API Endpoints", test_api_azure_integration.main),
+]
+
+def main():
+    """Run every suite inside one asyncio.Runner instead of one loop per script"""
+    results = {}
+
+    with asyncio.Runner() as runner:
+        for name, suite in SUITES:
+            results[name] = runner.run(suite())
+
+    print("\n" + "="*50)
+    print("📊 API TEST RUN SUMMARY:")
+    for name, success in results.items():
+        print(f"   {'✅' if success else '❌'} {name}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -10,108 +10,74 @@ import json
 
 BASE_URL = "http://localhost:8001"
 
-async def test_offline_ai_logic():
-    """Test AI logic with known product tags"""
-    print("🚀 ManipulatorAI Step 5: Offline AI Logic Test")
-    print("=" * 50)
-    
-    async with aiohttp.ClientSession() as session:
-        # Test 1: Direct product matching with exact tags
-        print("🔄 Test 1: Direct product matching with smartphone tags...")
-        async with session.post(
-            f"{BASE_URL}/ai/match-products",
-            json={"keywords": ["smartphone", "mobile", "android"], "threshold": 0.3}
-        ) as response:
-            if response.status == 200:
-                data = await response.json()
-                print(f"   ✅ Found {data['matches_found']} matches")
-                if data['matches_found'] > 0:
-                    match = data['matches'][0]
-                    print(f"   📦 Product: {match['product_name']}")
-                    print(f"   🎯 Score: {match['score']}")
-            else:
-                print(f"   ❌ Failed: {response.status}")
-        
-        # Test 2: Product matching with laptop tags
-        print("\n🔄 Test 2: Direct product matching with laptop tags...")
-        async with session.post(
-            f"{BASE_URL}/ai/match-products",
-            json={"keywords": ["laptop", "computer", "work"], "threshold": 0.3}
-        ) as response:
-            if response.status == 200:
-                data = await response.json()
-                print(f"   ✅ Found {data['matches_found']} matches")
-                if data['matches_found'] > 0:
-                    match = data['matches'][0]
-                    print(f"   📦 Product: {match['product_name']}")
-                    print(f"   🎯 Score: {match['score']}")
-            else:
-                print(f"   ❌ Failed: {response.status}")
-        
-        # Test 3: Product matching with fashion tags
-        print("\n🔄 Test 3: Direct product matching with fashion tags...")
-        async with session.post(
-            f"{BASE_URL}/ai/match-products",
-            json={"keywords": ["shirt", "clothing", "fashion"], "threshold": 0.3}
-        ) as response:
-            if response.status == 200:
-                data = await response.json()
-                print(f"   ✅ Found {data['matches_found']} matches")
-                if data['matches_found'] > 0:
-                    match = data['matches'][0]
-                    print(f"   📦 Product: {match['product_name']}")
-                    print(f"   🎯 Score: {match['score']}")
-            else:
-                print(f"   ❌ Failed: {response.status}")
-        
-        # Test 4: Product matching with headphone tags
-        print("\n🔄 Test 4: Direct product matching with headphone tags...")
+# Requests allowed in flight at once; matches the session connection limit
+MAX_IN_FLIGHT = 16
+
+# (title, keywords, threshold, matches to show; None shows only the best match)
+MATCH_CASES = [
+    ("Direct product matching with smartphone tags", ["smartphone", "mobile", "android"], 0.3, None),
+    ("Direct product matching with laptop tags", ["laptop", "computer", "work"], 0.3, None),
+    ("Direct product matching with fashion tags", ["shirt", "clothing", "fashion"], 0.3, None),
+    ("Direct product matching with headphone tags", ["headphones", "audio", "music"], 0.3, None),
+    ("Cross-category keyword matching", ["tech", "electronics", "wireless"], 0.2, 3),
+    ("Low threshold matching", ["premium", "quality"], 0.1, 2),
+]
+
+async def match_products(session, semaphore, keywords, threshold):
+    """Call the tagMatcher endpoint and return (status, data)"""
+    async with semaphore:
         async with session.post(
             f"{BASE_URL}/ai/match-products",
-            json={"keywords": ["headphones", "audio", "music"], "threshold": 0.3}
+            json={"keywords": keywords, "threshold": threshold}
         ) as response:
             if response.status == 200:
-                data = await response.json()
-                print(f"   ✅ Found {data['matches_found']} matches")
+                return response.status, await response.json()
+            return response.status, None
+
+async def test_offline_ai_logic():
+    """Test AI logic with known product tags"""
+    print("🚀 ManipulatorAI Step 5: Offline AI Logic Test")
+    print("=" * 50)
+
+    semaphore = asyncio.Semaphore(MAX_IN_FLIGHT)
+    # Cache the localhost lookup and keep connections open for the whole run
+    connector = aiohttp.TCPConnector(
+        limit=MAX_IN_FLIGHT,
+        ttl_dns_cache=300,
+        keepalive_timeout=60
+    )
+    timeout = aiohttp.ClientTimeout(total=45)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        # The cases are independent, so send them all at once and
+        # report the results in order afterwards
+        results = await asyncio.gather(*(
+            match_products(session, semaphore, keywords, threshold)
+            for _, keywords, threshold, _ in MATCH_CASES
+        ))
+
+        for number, ((title, _, _, show), (status, data)) in enumerate(zip(MATCH_CASES, results), start=1):
+            prefix = "🔄" if number == 1 else "\n🔄"
+            print(f"{prefix} Test {number}: {title}...")
+
+            if data is None:
+                print(f"   ❌ Failed: {status}")
+                continue
+
+            print(f"   ✅ Found {data['matches_found']} matches")
+            if show is None:
                 if data['matches_found'] > 0:
                     match = data['matches'][0]
                     print(f"   📦 Product: {match['product_name']}")
                     print(f"   🎯 Score: {match['score']}")
             else:
-                print(f"   ❌ Failed: {response.status}")
-        
-        # Test 5: Cross-category matching
-        print("\n🔄 Test 5: Cross-category keyword matching...")
-        async with session.post(
-            f"{BASE_URL}/ai/match-products",
-            json={"keywords": ["tech", "electronics", "wireless"], "threshold": 0.2}
-        ) as response:
-            if response.status == 200:
-                data = await response.json()
-                print(f"   ✅ Found {data['matches_found']} matches")
-                for match in data['matches'][:3]:  # Show top 3
+                for match in data['matches'][:show]:
                     print(f"   📦 {match['product_name']} (Score: {match['score']:.3f})")
-            else:
-                print(f"   ❌ Failed: {response.status}")
-        
-        # Test 6: Low threshold matching  
-        print("\n🔄 Test 6: Low threshold matching...")
-        async with session.post(
-            f"{BASE_URL}/ai/match-products",
-            json={"keywords": ["premium", "quality"], "threshold": 0.1}
-        ) as response:
-            if response.status == 200:
-                data = await response.json()
-                print(f"   ✅ Found {data['matches_found']} matches")
-                for match in data['matches'][:2]:  # Show top 2
-                    print(f"   📦 {match['product_name']} (Score: {match['score']:.3f})")
-            else:
-                print(f"   ❌ Failed: {response.status}")
-    
+
     print("\n" + "=" * 50)
     print("✅ tagMatcher subsystem verification complete!")
     print("   • Smartphone matching: ✅")
-    print("   • Laptop matching: ✅") 
+    print("   • Laptop matching: ✅")
     print("   • Fashion matching: ✅")
     print("   • Audio product matching: ✅")
     print("   • Cross-category matching: ✅")
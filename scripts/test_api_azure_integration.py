@@ -8,61 +8,20 @@ import asyncio
 import httpx
 import sys
 import time
-import subprocess
-import signal
-import os
-from pathlib import Path
 
-BASE_URL = "http://127.0.0.1:8002"
+from _app_fixture import running_app
+
+APP_PORT = 8002
+BASE_URL = f"http://127.0.0.1:{APP_PORT}"
 
 class APIEndpointTester:
     """Test Azure OpenAI integration through API endpoints"""
     
-    def __init__(self):
-        self.app_process = None
+    def __init__(self, base_url: str = BASE_URL):
+        self.base_url = base_url
         self.tests_passed = 0
         self.tests_failed = 0
     
-    def start_application(self):
-        """Start the FastAPI application"""
-        try:
-            print("🚀 Starting FastAPI application...")
-            cmd = [
-                sys.executable, "-m", "uvicorn", 
-                "app.main:app", 
-                "--host", "127.0.0.1", 
-                "--port", "8002",
-                "--reload"
-            ]
-            
-            self.app_process = subprocess.Popen(
-                cmd, 
-                cwd=Path(__file__).parent.parent,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            
-            # Wait for app to start
-            print("⏳ Waiting for application to start...")
-            time.sleep(8)  # Give it time to start
-            
-            return True
-            
-        except Exception as e:
-            print(f"❌ Failed to start application: {e}")
-            return False
-    
-    def stop_application(self):
-        """Stop the FastAPI application"""
-        if self.app_process:
-            print("🛑 Stopping application...")
-            self.app_process.terminate()
-            try:
-                self.app_process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.app_process.kill()
-                self.app_process.wait()
-    
     def log_test_result(self, test_name: str, success: bool, details: str = ""):
         """Log test results"""
         status = "✅ PASS" if success else "❌ FAIL"
@@ -79,7 +38,7 @@ class APIEndpointTester:
         """Test basic application health"""
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.get(f"{BASE_URL}/health")
+                response = await client.get(f"{self.base_url}/health")
                 success = response.status_code == 200
                 
                 self.log_test_result(
@@ -103,7 +62,7 @@ class APIEndpointTester:
                 }
                 
                 response = await client.post(
-                    f"{BASE_URL}/ai/extract-keywords",
+                    f"{self.base_url}/ai/extract-keywords",
                     json=payload,
                     timeout=30.0
                 )
@@ -135,7 +94,7 @@ class APIEndpointTester:
                 }
                 
                 response = await client.post(
-                    f"{BASE_URL}/ai/full-pipeline",
+                    f"{self.base_url}/ai/full-pipeline",
                     json=payload,
                     timeout=45.0
                 )
@@ -162,7 +121,7 @@ class APIEndpointTester:
         """Test API documentation accessibility"""
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.get(f"{BASE_URL}/docs")
+                response = await client.get(f"{self.base_url}/docs")
                 success = response.status_code == 200
                 
                 self.log_test_result(
@@ -190,7 +149,7 @@ class APIEndpointTester:
                         "business_context": "We sell mobile devices"
                     }
                     task = client.post(
-                        f"{BASE_URL}/ai/extract-keywords",
+                        f"{self.base_url}/ai/extract-keywords",
                         json=payload,
                         timeout=30.0
                     )
@@ -222,45 +181,37 @@ class APIEndpointTester:
         print("🧪 AZURE OPENAI API ENDPOINT TESTING")
         print("="*50)
         
-        # Start application
-        if not self.start_application():
-            print("❌ Failed to start application. Cannot proceed with tests.")
-            return False
+        print("\n📋 Basic Tests:")
+        await self.test_health_check()
+        await self.test_docs_accessibility()
         
-        try:
-            print("\n📋 Basic Tests:")
-            await self.test_health_check()
-            await self.test_docs_accessibility()
-            
-            print("\n🧠 AI Integration Tests:")
-            await self.test_keyword_extraction_endpoint()
-            await self.test_full_pipeline_endpoint()
-            
-            print("\n⚡ Performance Tests:")
-            await self.test_performance_under_load()
-            
-            # Summary
-            print("\n" + "="*50)
-            print("📊 API ENDPOINT TEST SUMMARY:")
-            print(f"   ✅ Tests Passed: {self.tests_passed}")
-            print(f"   ❌ Tests Failed: {self.tests_failed}")
-            
-            if self.tests_failed == 0:
-                print("\n🎉 ALL API TESTS PASSED!")
-                print("✅ Azure OpenAI integration through FastAPI: WORKING")
-                return True
-            else:
-                print(f"\n⚠️  {self.tests_failed} test(s) failed.")
-                return False
+        print("\n🧠 AI Integration Tests:")
+        await self.test_keyword_extraction_endpoint()
+        await self.test_full_pipeline_endpoint()
+        
+        print("\n⚡ Performance Tests:")
+        await self.test_performance_under_load()
+        
+        # Summary
+        print("\n" + "="*50)
+        print("📊 API ENDPOINT TEST SUMMARY:")
+        print(f"   ✅ Tests Passed: {self.tests_passed}")
+        print(f"   ❌ Tests Failed: {self.tests_failed}")
         
-        finally:
-            self.stop_application()
+        if self.tests_failed == 0:
+            print("\n🎉 ALL API TESTS PASSED!")
+            print("✅ Azure OpenAI integration through FastAPI: WORKING")
+            return True
+        else:
+            print(f"\n⚠️  {self.tests_failed} test(s) failed.")
+            return False
 
 async def main():
     """Main test runner"""
     try:
-        tester = APIEndpointTester()
-        success = await tester.run_all_tests()
+        async with running_app(APP_PORT, app_path="app.main:app") as base_url:
+            tester = APIEndpointTester(base_url)
+            success = await tester.run_all_tests()
         
         if success:
             print("\n🚀 AZURE OPENAI API INTEGRATION: FULLY OPERATIONAL!")
@@ -4,10 +4,11 @@ Direct test of Azure OpenAI keyword extraction
 """
 import asyncio
 import sys
-import os
+from pathlib import Path
 
-# Add the parent directory to Python path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
 
 from app.services.ai_service import AzureOpenAIService
 
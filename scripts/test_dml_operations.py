@@ -19,7 +19,7 @@ from app.services.product_service import ProductService
 from app.services.conversation_service import ConversationService
 from app.models.schemas import (
     ProductCreate, ConversationCreate, ConversationMessage, 
-    MessageSender, ConversationBranch
+    MessageSender, ConversationBranch, ConversationStatus
 )
 import logging
 
@@ -211,7 +211,6 @@ class DatabaseTester:
             # Test 4: UPDATE - Update conversation status
             if created_conversations:
                 try:
-                    from app.models.schemas import ConversationStatus
                     conversation_id = created_conversations[0].conversation_id
                     success = await conversation_service.update_conversation_status(
                         conversation_id, ConversationStatus.QUALIFIED
@@ -13,6 +13,35 @@ from pathlib import Path
 
 BASE_URL = "http://127.0.0.1:8004"
 
+# Request bodies are encoded once at import instead of on every call
+_JSON_HEADERS = {"content-type": "application/json"}
+
+KEYWORD_EXTRACT_BODY = json.dumps({
+    "message": "I'm looking for a gaming laptop with great graphics card",
+    "business_context": "We sell high-performance laptops and gaming computers"
+}).encode()
+
+PRODUCT_MATCH_BODY = json.dumps({
+    "keywords": ["laptop", "gaming", "graphics"],
+    "threshold": 0.3
+}).encode()
+
+FULL_PIPELINE_BODY = json.dumps({
+    "message": "Hi! I need a smartphone with excellent camera for photography",
+    "business_context": "We sell premium smartphones and mobile accessories"
+}).encode()
+
+CONVERSATION_MESSAGE_BODY = json.dumps({
+    "customer_id": "test_customer_comprehensive",
+    "business_id": "test_business_comprehensive",
+    "message": "Hi! I'm interested in your products",
+    "platform": "facebook"
+}).encode()
+
+def _ok(response) -> bool:
+    """True for any 2xx response"""
+    return 200 <= response.status_code < 300
+
 class FastAPITester:
     """Comprehensive tester for the main FastAPI application"""
     
@@ -37,7 +66,7 @@ class FastAPITester:
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.get(f"{BASE_URL}/")
-                success = response.status_code == 200
+                success = _ok(response)
                 
                 if success:
                     data = response.json()
@@ -61,7 +90,7 @@ class FastAPITester:
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.get(f"{BASE_URL}/health")
-                success = response.status_code == 200
+                success = _ok(response)
                 
                 if success:
                     data = response.json()
@@ -91,18 +120,14 @@ class FastAPITester:
         """Test AI keyword extraction endpoint"""
         try:
             async with httpx.AsyncClient() as client:
-                payload = {
-                    "message": "I'm looking for a gaming laptop with great graphics card",
-                    "business_context": "We sell high-performance laptops and gaming computers"
-                }
-                
                 response = await client.post(
                     f"{BASE_URL}/ai/extract-keywords",
-                    json=payload,
+                    content=KEYWORD_EXTRACT_BODY,
+                    headers=_JSON_HEADERS,
                     timeout=30.0
                 )
                 
-                success = response.status_code == 200
+                success = _ok(response)
                 if success:
                     data = response.json()
                     keywords = data.get("extracted_keywords", [])
@@ -122,18 +147,14 @@ class FastAPITester:
         """Test AI product matching endpoint"""
         try:
             async with httpx.AsyncClient() as client:
-                payload = {
-                    "keywords": ["laptop", "gaming", "graphics"],
-                    "threshold": 0.3
-                }
-                
                 response = await client.post(
                     f"{BASE_URL}/ai/match-products",
-                    json=payload,
+                    content=PRODUCT_MATCH_BODY,
+                    headers=_JSON_HEADERS,
                     timeout=30.0
                 )
                 
-                success = response.status_code == 200
+                success = _ok(response)
                 if success:
                     data = response.json()
                     matches = data.get("matches", [])
@@ -154,18 +175,14 @@ class FastAPITester:
         """Test the full AI pipeline"""
         try:
             async with httpx.AsyncClient() as client:
-                payload = {
-                    "message": "Hi! I need a smartphone with excellent camera for photography",
-                    "business_context": "We sell premium smartphones and mobile accessories"
-                }
-                
                 response = await client.post(
                     f"{BASE_URL}/ai/full-pipeline",
-                    json=payload,
+                    content=FULL_PIPELINE_BODY,
+                    headers=_JSON_HEADERS,
                     timeout=45.0
                 )
                 
-                success = response.status_code == 200
+                success = _ok(response)
                 if success:
                     data = response.json()
                     pipeline_status = data.get("pipeline_status", "")
@@ -195,7 +212,7 @@ class FastAPITester:
             async with httpx.AsyncClient() as client:
                 # Test get all products
                 response = await client.get(f"{BASE_URL}/products/")
-                success = response.status_code == 200
+                success = _ok(response)
                 
                 if success:
                     products = response.json()
@@ -215,20 +232,14 @@ class FastAPITester:
         """Test conversations API endpoint"""
         try:
             async with httpx.AsyncClient() as client:
-                payload = {
-                    "customer_id": "test_customer_comprehensive",
-                    "business_id": "test_business_comprehensive",
-                    "message": "Hi! I'm interested in your products",
-                    "platform": "facebook"
-                }
-                
                 response = await client.post(
                     f"{BASE_URL}/conversation/message",
-                    json=payload,
+                    content=CONVERSATION_MESSAGE_BODY,
+                    headers=_JSON_HEADERS,
                     timeout=30.0
                 )
                 
-                success = response.status_code == 200
+                success = _ok(response)
                 if success:
                     data = response.json()
                     has_conversation_id = "conversation_id" in data
@@ -257,7 +268,7 @@ class FastAPITester:
                 }
                 
                 response = await client.get(f"{BASE_URL}/webhook/facebook", params=params)
-                success = response.status_code == 200
+                success = _ok(response)
                 
                 if success:
                     challenge_response = response.text.strip('"')  # Remove quotes if present
@@ -279,11 +290,11 @@ class FastAPITester:
             async with httpx.AsyncClient() as client:
                 # Test OpenAPI docs
                 response = await client.get(f"{BASE_URL}/docs")
-                docs_success = response.status_code == 200
+                docs_success = _ok(response)
                 
                 # Test OpenAPI JSON
                 response = await client.get(f"{BASE_URL}/openapi.json")
-                openapi_success = response.status_code == 200
+                openapi_success = _ok(response)
                 
                 success = docs_success and openapi_success
                 details = f"Docs: {'✅' if docs_success else '❌'}, OpenAPI: {'✅' if openapi_success else '❌'}"
@@ -312,7 +323,7 @@ class FastAPITester:
                 
                 successful_requests = sum(
                     1 for r in responses 
-                    if isinstance(r, httpx.Response) and r.status_code == 200
+                    if isinstance(r, httpx.Response) and _ok(r)
                 )
                 
                 success = successful_requests >= 4 and total_time < 5
@@ -6,92 +6,132 @@ Tests Azure OpenAI through simplified FastAPI endpoints
 
 import asyncio
 import httpx
+import math
+import orjson
+import os
 import sys
 import time
-import subprocess
-import signal
-import os
-from pathlib import Path
 
-BASE_URL = "http://127.0.0.1:8003"
+from _app_fixture import running_app
+
+APP_PORT = 8003
+BASE_URL = f"http://127.0.0.1:{APP_PORT}"
+
+# Every load-test request is a paid Azure OpenAI call, so the default stays
+# small; raise LOAD_TEST_REQUESTS to exercise connection reuse properly
+LOAD_TEST_REQUESTS = int(os.getenv("LOAD_TEST_REQUESTS", "3"))
+
+# Latency budgets for the load test, in seconds. A request that errors or
+# returns a non-200 status never answered, so it counts as over budget
+LOAD_TEST_P50_SECONDS = float(os.getenv("LOAD_TEST_P50_SECONDS", "10"))
+LOAD_TEST_P95_SECONDS = float(os.getenv("LOAD_TEST_P95_SECONDS", "20"))
+
+# Requests allowed in flight at once; matches the client connection pool
+MAX_IN_FLIGHT = 16
+
+# Opt-in HTTP/2 for servers that speak it (needs httpx[http2]); uvicorn
+# itself only serves HTTP/1.1, so the default stays off
+USE_HTTP2 = os.getenv("TEST_HTTP2", "").lower() in ("1", "true", "yes")
+
+# Endpoint paths, relative to the client's base_url
+HEALTH_URL = "/health"
+AI_HEALTH_URL = "/api/v1/ai/health"
+DOCS_URL = "/docs"
+EXTRACT_URL = "/api/v1/ai/extract-keywords"
+GENERATE_URL = "/api/v1/ai/generate-response"
+PIPELINE_URL = "/api/v1/ai/full-pipeline"
+
+# Request payloads, built once instead of on every call
+KEYWORD_PAYLOAD = {
+    "message": "I'm looking for a smartphone with great camera quality",
+    "business_context": "We sell electronics including smartphones and accessories"
+}
+
+RESPONSE_PAYLOAD = {
+    "message": "Hi! I need a laptop for gaming and programming",
+    "branch": "convincer",
+    "is_welcome": True
+}
+
+PIPELINE_PAYLOAD = {
+    "message": "Hi! I need a laptop for gaming and programming",
+    "business_context": "We sell high-performance laptops and gaming computers",
+    "branch": "convincer"
+}
+
+# The load test only varies the message
+_KEYWORD_PAYLOAD_BASE = {"business_context": "We sell mobile devices"}
+
+# Untimed request sent before the load test
+WARMUP_PAYLOAD = {**_KEYWORD_PAYLOAD_BASE, "message": "warmup"}
 
 class SimplifiedAPITester:
     """Test Azure OpenAI integration through simplified API endpoints"""
     
-    def __init__(self):
-        self.app_process = None
+    def __init__(self, base_url: str = BASE_URL):
+        self.base_url = base_url
+        self.client = None
+        self.semaphore = None
+        self._log = []
         self.tests_passed = 0
         self.tests_failed = 0
     
-    def start_application(self):
-        """Start the simplified FastAPI application"""
-        try:
-            print("🚀 Starting simplified FastAPI application...")
-            cmd = [
-                sys.executable, "-m", "uvicorn", 
-                "app.main_simple:app", 
-                "--host", "127.0.0.1", 
-                "--port", "8003",
-                "--reload"
-            ]
-            
-            self.app_process = subprocess.Popen(
-                cmd, 
-                cwd=Path(__file__).parent.parent,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            
-            # Wait for app to start
-            print("⏳ Waiting for application to start...")
-            time.sleep(10)  # Give it time to start
-            
-            return True
-            
-        except Exception as e:
-            print(f"❌ Failed to start application: {e}")
-            return False
+    async def __aenter__(self):
+        """Open one HTTP client shared by every test"""
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=USE_HTTP2,
+            timeout=45.0,
+            limits=httpx.Limits(max_keepalive_connections=MAX_IN_FLIGHT, max_connections=MAX_IN_FLIGHT)
+        )
+        self.semaphore = asyncio.Semaphore(MAX_IN_FLIGHT)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        """Close the shared HTTP client"""
+        if self.client:
+            await self.client.aclose()
     
-    def stop_application(self):
-        """Stop the FastAPI application"""
-        if self.app_process:
-            print("🛑 Stopping application...")
-            self.app_process.terminate()
-            try:
-                self.app_process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.app_process.kill()
-                self.app_process.wait()
+    async def gated(self, coro):
+        """Await a request once a connection slot is free"""
+        async with self.semaphore:
+            return await coro
     
     def log_test_result(self, test_name: str, success: bool, details: str = ""):
         """Log test results"""
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name}")
+        self._log.append(f"{status} {test_name}")
         if details:
-            print(f"    {details}")
+            self._log.append(f"    {details}")
         
         if success:
             self.tests_passed += 1
         else:
             self.tests_failed += 1
     
+    def flush_log(self):
+        """Write the buffered results of a section in one go"""
+        if self._log:
+            sys.stdout.write("\n".join(self._log) + "\n")
+            sys.stdout.flush()
+            self._log.clear()
+    
     async def test_health_check(self):
         """Test basic application health"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{BASE_URL}/health")
-                success = response.status_code == 200
-                
-                if success:
-                    data = response.json()
-                    azure_configured = data.get("azure_openai_configured", False)
-                    details = f"Status: {response.status_code}, Azure OpenAI: {'✅' if azure_configured else '❌'}"
-                else:
-                    details = f"Status: {response.status_code}"
-                
-                self.log_test_result("Application Health Check", success, details)
-                return success
-                
+            response = await self.client.get(HEALTH_URL)
+            success = response.status_code == 200
+            
+            if success:
+                data = orjson.loads(response.content)
+                azure_configured = data.get("azure_openai_configured", False)
+                details = f"Status: {response.status_code}, Azure OpenAI: {'✅' if azure_configured else '❌'}"
+            else:
+                details = f"Status: {response.status_code}"
+            
+            self.log_test_result("Application Health Check", success, details)
+            return success
+            
         except Exception as e:
             self.log_test_result("Application Health Check", False, f"Error: {e}")
             return False
@@ -99,21 +139,20 @@ class SimplifiedAPITester:
     async def test_ai_health_check(self):
         """Test AI service health"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{BASE_URL}/api/v1/ai/health")
-                success = response.status_code == 200
-                
-                if success:
-                    data = response.json()
-                    ai_status = data.get("status", "unknown")
-                    azure_status = data.get("azure_openai", "unknown")
-                    details = f"AI: {ai_status}, Azure: {azure_status}"
-                else:
-                    details = f"Status: {response.status_code}"
-                
-                self.log_test_result("AI Service Health Check", success, details)
-                return success
-                
+            response = await self.client.get(AI_HEALTH_URL)
+            success = response.status_code == 200
+            
+            if success:
+                data = orjson.loads(response.content)
+                ai_status = data.get("status", "unknown")
+                azure_status = data.get("azure_openai", "unknown")
+                details = f"AI: {ai_status}, Azure: {azure_status}"
+            else:
+                details = f"Status: {response.status_code}"
+            
+            self.log_test_result("AI Service Health Check", success, details)
+            return success
+            
         except Exception as e:
             self.log_test_result("AI Service Health Check", False, f"Error: {e}")
             return False
@@ -121,30 +160,24 @@ class SimplifiedAPITester:
     async def test_keyword_extraction_endpoint(self):
         """Test keyword extraction through API"""
         try:
-            async with httpx.AsyncClient() as client:
-                payload = {
-                    "message": "I'm looking for a smartphone with great camera quality",
-                    "business_context": "We sell electronics including smartphones and accessories"
-                }
-                
-                response = await client.post(
-                    f"{BASE_URL}/api/v1/ai/extract-keywords",
-                    json=payload,
-                    timeout=30.0
-                )
-                
-                success = response.status_code == 200
-                if success:
-                    data = response.json()
-                    keywords = data.get("extracted_keywords", [])
-                    success = len(keywords) > 0 and data.get("status") == "success"
-                    details = f"Status: {response.status_code}, Keywords: {keywords}"
-                else:
-                    details = f"Status: {response.status_code}"
-                
-                self.log_test_result("Keyword Extraction API", success, details)
-                return success
-                
+            response = await self.client.post(
+                EXTRACT_URL,
+                json=KEYWORD_PAYLOAD,
+                timeout=30.0
+            )
+            
+            success = response.status_code == 200
+            if success:
+                data = orjson.loads(response.content)
+                keywords = data.get("extracted_keywords", [])
+                success = len(keywords) > 0 and data.get("status") == "success"
+                details = f"Status: {response.status_code}, Keywords: {keywords}"
+            else:
+                details = f"Status: {response.status_code}"
+            
+            self.log_test_result("Keyword Extraction API", success, details)
+            return success
+            
         except Exception as e:
             self.log_test_result("Keyword Extraction API", False, f"Error: {e}")
             return False
@@ -152,31 +185,24 @@ class SimplifiedAPITester:
     async def test_response_generation_endpoint(self):
         """Test response generation through API"""
         try:
-            async with httpx.AsyncClient() as client:
-                payload = {
-                    "message": "Hi! I need a laptop for gaming and programming",
-                    "branch": "convincer",
-                    "is_welcome": True
-                }
-                
-                response = await client.post(
-                    f"{BASE_URL}/api/v1/ai/generate-response",
-                    json=payload,
-                    timeout=30.0
-                )
-                
-                success = response.status_code == 200
-                if success:
-                    data = response.json()
-                    ai_response = data.get("ai_response", "")
-                    success = len(ai_response) > 20 and data.get("status") == "success"
-                    details = f"Status: {response.status_code}, Response length: {len(ai_response)}"
-                else:
-                    details = f"Status: {response.status_code}"
-                
-                self.log_test_result("Response Generation API", success, details)
-                return success
-                
+            response = await self.client.post(
+                GENERATE_URL,
+                json=RESPONSE_PAYLOAD,
+                timeout=30.0
+            )
+            
+            success = response.status_code == 200
+            if success:
+                data = orjson.loads(response.content)
+                ai_response = data.get("ai_response", "")
+                success = len(ai_response) > 20 and data.get("status") == "success"
+                details = f"Status: {response.status_code}, Response length: {len(ai_response)}"
+            else:
+                details = f"Status: {response.status_code}"
+            
+            self.log_test_result("Response Generation API", success, details)
+            return success
+            
         except Exception as e:
             self.log_test_result("Response Generation API", False, f"Error: {e}")
             return False
@@ -184,40 +210,33 @@ class SimplifiedAPITester:
     async def test_full_pipeline_endpoint(self):
         """Test full AI pipeline through API"""
         try:
-            async with httpx.AsyncClient() as client:
-                payload = {
-                    "message": "Hi! I need a laptop for gaming and programming",
-                    "business_context": "We sell high-performance laptops and gaming computers",
-                    "branch": "convincer"
-                }
+            response = await self.client.post(
+                PIPELINE_URL,
+                json=PIPELINE_PAYLOAD,
+                timeout=45.0
+            )
+            
+            success = response.status_code == 200
+            if success:
+                data = orjson.loads(response.content)
+                pipeline_status = data.get("pipeline_status", "")
+                ai_response = data.get("step_3_ai_response", "")
+                keywords = data.get("step_1_keywords", [])
+                matches = data.get("step_2_matches", 0)
                 
-                response = await client.post(
-                    f"{BASE_URL}/api/v1/ai/full-pipeline",
-                    json=payload,
-                    timeout=45.0
+                success = (
+                    pipeline_status == "complete" and 
+                    len(ai_response) > 20 and 
+                    len(keywords) > 0 and 
+                    data.get("status") == "success"
                 )
-                
-                success = response.status_code == 200
-                if success:
-                    data = response.json()
-                    pipeline_status = data.get("pipeline_status", "")
-                    ai_response = data.get("step_3_ai_response", "")
-                    keywords = data.get("step_1_keywords", [])
-                    matches = data.get("step_2_matches", 0)
-                    
-                    success = (
-                        pipeline_status == "complete" and 
-                        len(ai_response) > 20 and 
-                        len(keywords) > 0 and 
-                        data.get("status") == "success"
-                    )
-                    details = f"Pipeline: {pipeline_status}, Keywords: {len(keywords)}, Matches: {matches}, Response: {len(ai_response)} chars"
-                else:
-                    details = f"Status: {response.status_code}"
-                
-                self.log_test_result("Full AI Pipeline API", success, details)
-                return success
-                
+                details = f"Pipeline: {pipeline_status}, Keywords: {len(keywords)}, Matches: {matches}, Response: {len(ai_response)} chars"
+            else:
+                details = f"Status: {response.status_code}"
+            
+            self.log_test_result("Full AI Pipeline API", success, details)
+            return success
+            
         except Exception as e:
             self.log_test_result("Full AI Pipeline API", False, f"Error: {e}")
             return False
@@ -225,13 +244,13 @@ class SimplifiedAPITester:
     async def test_docs_accessibility(self):
         """Test API documentation accessibility"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{BASE_URL}/docs")
+            # Only the status matters, so don't buffer the Swagger page
+            async with self.client.stream("GET", DOCS_URL) as response:
                 success = response.status_code == 200
-                
-                self.log_test_result("API Documentation", success, f"Status: {response.status_code}")
-                return success
-                
+            
+            self.log_test_result("API Documentation", success, f"Status: {response.status_code}")
+            return success
+            
         except Exception as e:
             self.log_test_result("API Documentation", False, f"Error: {e}")
             return False
@@ -239,37 +258,55 @@ class SimplifiedAPITester:
     async def test_performance_under_load(self):
         """Test API performance with multiple requests"""
         try:
-            async with httpx.AsyncClient() as client:
-                start_time = time.time()
-                
-                # Create 3 concurrent requests
-                tasks = []
-                for i in range(3):
-                    payload = {
-                        "message": f"I need a smartphone {i}",
-                        "business_context": "We sell mobile devices"
-                    }
-                    task = client.post(
-                        f"{BASE_URL}/api/v1/ai/extract-keywords",
+            # Monotonic clock, looked up once for the whole test
+            now = time.perf_counter
+            latencies = []
+            
+            async def timed_request(i):
+                payload = {**_KEYWORD_PAYLOAD_BASE, "message": f"I need a smartphone {i}"}
+                request_start = now()
+                try:
+                    response = await self.client.post(
+                        EXTRACT_URL,
                         json=payload,
                         timeout=30.0
                     )
-                    tasks.append(task)
-                
-                responses = await asyncio.gather(*tasks, return_exceptions=True)
-                total_time = time.time() - start_time
-                
-                successful_requests = sum(
-                    1 for r in responses 
-                    if isinstance(r, httpx.Response) and r.status_code == 200
-                )
-                
-                success = successful_requests >= 2 and total_time < 20
-                details = f"3 requests in {total_time:.2f}s, {successful_requests}/3 successful"
-                
-                self.log_test_result("Performance Under Load", success, details)
-                return success
-                
+                except httpx.HTTPError:
+                    latencies.append(float("inf"))
+                    return
+                if response.status_code == 200:
+                    latencies.append(now() - request_start)
+                else:
+                    latencies.append(float("inf"))
+            
+            # Prime the server's Azure OpenAI client and connection pool
+            # so the measured batch doesn't include one-off startup cost
+            await self.client.post(EXTRACT_URL, json=WARMUP_PAYLOAD, timeout=30.0)
+            
+            start_time = now()
+            
+            # Fire the concurrent requests, at most MAX_IN_FLIGHT at a time
+            await asyncio.gather(*(self.gated(timed_request(i)) for i in range(LOAD_TEST_REQUESTS)))
+            
+            total_time = now() - start_time
+            
+            # Nearest-rank percentiles over every request, failures included
+            latencies.sort()
+            p50 = latencies[max(0, math.ceil(len(latencies) * 0.50) - 1)]
+            p95 = latencies[max(0, math.ceil(len(latencies) * 0.95) - 1)]
+            failed_requests = sum(1 for latency in latencies if latency == float("inf"))
+            
+            success = p50 <= LOAD_TEST_P50_SECONDS and p95 <= LOAD_TEST_P95_SECONDS
+            details = (
+                f"{LOAD_TEST_REQUESTS} requests in {total_time:.2f}s, "
+                f"p50 {p50:.2f}s (budget {LOAD_TEST_P50_SECONDS:.0f}s), "
+                f"p95 {p95:.2f}s (budget {LOAD_TEST_P95_SECONDS:.0f}s), "
+                f"{failed_requests} failed"
+            )
+            
+            self.log_test_result("Performance Under Load", success, details)
+            return success
+            
         except Exception as e:
             self.log_test_result("Performance Under Load", False, f"Error: {e}")
             return False
@@ -279,47 +316,48 @@ class SimplifiedAPITester:
         print("🧪 AZURE OPENAI SIMPLIFIED API TESTING")
         print("="*50)
         
-        # Start application
-        if not self.start_application():
-            print("❌ Failed to start application. Cannot proceed with tests.")
-            return False
+        # Tests within a group are independent, so run them concurrently.
+        # The load test stays on its own so its timing is not skewed.
+        print("\n📋 Basic Tests:")
+        await asyncio.gather(
+            self.test_health_check(),
+            self.test_ai_health_check(),
+            self.test_docs_accessibility()
+        )
+        self.flush_log()
         
-        try:
-            print("\n📋 Basic Tests:")
-            await self.test_health_check()
-            await self.test_ai_health_check()
-            await self.test_docs_accessibility()
-            
-            print("\n🧠 AI Integration Tests:")
-            await self.test_keyword_extraction_endpoint()
-            await self.test_response_generation_endpoint()
-            await self.test_full_pipeline_endpoint()
-            
-            print("\n⚡ Performance Tests:")
-            await self.test_performance_under_load()
-            
-            # Summary
-            print("\n" + "="*50)
-            print("📊 SIMPLIFIED API TEST SUMMARY:")
-            print(f"   ✅ Tests Passed: {self.tests_passed}")
-            print(f"   ❌ Tests Failed: {self.tests_failed}")
-            
-            if self.tests_failed == 0:
-                print("\n🎉 ALL API TESTS PASSED!")
-                print("✅ Azure OpenAI integration through FastAPI: WORKING")
-                return True
-            else:
-                print(f"\n⚠️  {self.tests_failed} test(s) failed.")
-                return False
+        print("\n🧠 AI Integration Tests:")
+        await asyncio.gather(
+            self.test_keyword_extraction_endpoint(),
+            self.test_response_generation_endpoint(),
+            self.test_full_pipeline_endpoint()
+        )
+        self.flush_log()
+        
+        print("\n⚡ Performance Tests:")
+        await self.test_performance_under_load()
+        self.flush_log()
+        
+        # Summary
+        print("\n" + "="*50)
+        print("📊 SIMPLIFIED API TEST SUMMARY:")
+        print(f"   ✅ Tests Passed: {self.tests_passed}")
+        print(f"   ❌ Tests Failed: {self.tests_failed}")
         
-        finally:
-            self.stop_application()
+        if self.tests_failed == 0:
+            print("\n🎉 ALL API TESTS PASSED!")
+            print("✅ Azure OpenAI integration through FastAPI: WORKING")
+            return True
+        else:
+            print(f"\n⚠️  {self.tests_failed} test(s) failed.")
+            return False
 
 async def main():
     """Main test runner"""
     try:
-        tester = SimplifiedAPITester()
-        success = await tester.run_all_tests()
+        async with running_app(APP_PORT) as base_url:
+            async with SimplifiedAPITester(base_url) as tester:
+                success = await tester.run_all_tests()
         
         if success:
             print("\n🚀 AZURE OPENAI FASTAPI INTEGRATION: FULLY OPERATIONAL!")
@@ -9,12 +9,15 @@ import sys
 from pathlib import Path
 import time
 import random
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 
 # Add the project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from app.core.config import settings
 from app.core.database import db_manager
 from app.services.product_service import ProductService
 from app.services.conversation_service import ConversationService
@@ -27,6 +30,65 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Sessions allowed in flight at once. Each holds a PostgreSQL connection,
+# so more than the engine's pool plus overflow only queues inside the pool
+MAX_CONCURRENT_SESSIONS = settings.postgres_pool_size + settings.postgres_max_overflow
+
+# Concurrent user counts the stress test is run at, in order
+LOAD_LEVELS = (10, 25, 50)
+
+# Fixed choice sets, built once as tuples rather than as list literals per draw
+SEARCH_TERMS = ('laptop', 'phone', 'headphones', 'electronics')
+PRODUCT_CATEGORIES = ('Electronics', 'Audio', 'Computing')
+PREFERENCE_CATEGORIES = ('electronics', 'audio', 'computing')
+BRANCHES = (ConversationBranch.MANIPULATOR, ConversationBranch.CONVINCER)
+INTENTS = ('inquiry', 'purchase_intent', 'price_check')
+SENTIMENTS = ('positive', 'neutral', 'negative')
+SESSION_MESSAGES = (
+    "Hello, I'm interested in your products!",
+    "Can you tell me more about the pricing?",
+    "Do you have any discounts available?",
+    "What's the warranty on this item?",
+    "I'd like to proceed with the purchase."
+)
+
+@dataclass
+class SessionPlan:
+    """Every random choice one user session makes, drawn before the run starts"""
+    search_term: str
+    is_admin: bool
+    price: float
+    category: str
+    product_ctx: str
+    branch: ConversationBranch
+    msg_count: int
+    intents: List[str]
+    sentiments: List[str]
+    think_times: List[float]
+    preference: str
+
+def build_session_plan(rng: random.Random, user_id: int) -> SessionPlan:
+    """Draw a session's choices from rng so sessions do no random calls while doing IO"""
+    # At least three messages; each later one is sent with 70% probability
+    # and the customer stops at the first one they skip
+    msg_count = 3
+    while msg_count < len(SESSION_MESSAGES) and rng.random() <= 0.7:
+        msg_count += 1
+    
+    return SessionPlan(
+        search_term=rng.choice(SEARCH_TERMS),
+        is_admin=user_id % 10 == 0,  # 10% of users are admins adding products
+        price=round(rng.uniform(10.0, 1000.0), 2),
+        category=rng.choice(PRODUCT_CATEGORIES),
+        product_ctx=str(rng.randint(1, 100)),
+        branch=rng.choice(BRANCHES),
+        msg_count=msg_count,
+        intents=[rng.choice(INTENTS) for _ in range(msg_count)],
+        sentiments=[rng.choice(SENTIMENTS) for _ in range(msg_count)],
+        think_times=[rng.uniform(0.01, 0.05) for _ in range(msg_count)],  # Pause before each message
+        preference=rng.choice(PREFERENCE_CATEGORIES)
+    )
+
 class StressTester:
     def __init__(self):
         self.results = {
@@ -34,165 +96,195 @@ class StressTester:
             'products_read': 0,
             'conversations_created': 0,
             'messages_added': 0,
-            'redis_operations': 0,
+            'mongo_writes': 0,
+            'redis_round_trips': 0,
+            'redis_commands': 0,
             'errors': 0,
             'start_time': None,
             'end_time': None
         }
+        # Holds only the shared MongoDB handle, so one instance serves every session
+        self.conversation_service = None
+        # Users requested for the current run and how many of them run at once
+        self.concurrent_users = 0
+        self.effective_concurrency = 0
 
-    async def simulate_user_session(self, user_id: int):
-        """Simulate a complete user session with database operations"""
-        try:
-            # 1. User searches for products (PostgreSQL READ)
-            async with db_manager.get_postgres_session() as session:
-                product_service = ProductService(session)
-                
-                # Simulate search
-                search_terms = ['laptop', 'phone', 'headphones', 'electronics']
-                search_term = random.choice(search_terms)
-                products = await product_service.search_products_by_keywords([search_term])
-                self.results['products_read'] += 1
-                
-                # Sometimes create a new product (simulate admin adding inventory)
-                if user_id % 10 == 0:  # 10% of users are admins adding products
-                    product = await product_service.create_product(ProductCreate(
-                        name=f"Product from User {user_id}",
-                        description=f"Product created by user {user_id} during stress test",
-                        price=round(random.uniform(10.0, 1000.0), 2),
-                        currency="USD",
-                        category=random.choice(['Electronics', 'Audio', 'Computing']),
-                        metadata={'user_id': str(user_id), 'stress_test': True}
-                    ))
-                    self.results['products_created'] += 1
-
-            # 2. Start conversation (MongoDB WRITE)
-            mongo_db = db_manager.get_mongo_db()
-            conversation_service = ConversationService(mongo_db)
+    async def _do_pg(self, user_id: int, plan: SessionPlan) -> dict:
+        """User searches for products (PostgreSQL READ), admins also add one"""
+        counters = {'products_read': 0, 'products_created': 0}
+        
+        async with db_manager.get_postgres_session() as session:
+            product_service = ProductService(session)
             
-            conversation = await conversation_service.create_conversation(ConversationCreate(
+            # Simulate search
+            products = await product_service.search_products_by_keywords([plan.search_term])
+            counters['products_read'] += 1
+            
+            # Sometimes create a new product (simulate admin adding inventory)
+            if plan.is_admin:
+                product = await product_service.create_product(ProductCreate(
+                    name=f"Product from User {user_id}",
+                    description=f"Product created by user {user_id} during stress test",
+                    price=plan.price,
+                    currency="USD",
+                    category=plan.category,
+                    metadata={'user_id': str(user_id), 'stress_test': True}
+                ))
+                counters['products_created'] += 1
+        
+        return counters
+
+    async def _do_mongo(self, user_id: int, plan: SessionPlan) -> dict:
+        """Write the session's conversation with all its messages (MongoDB WRITE)"""
+        counters = {'conversations_created': 0, 'messages_added': 0, 'mongo_writes': 0}
+        
+        # Not all users complete the full conversation; plan.msg_count says how far they get.
+        # Read the clock once and space the messages 10ms apart from there
+        base_time = datetime.now()
+        session_messages = [
+            ConversationMessage(
+                timestamp=base_time + timedelta(milliseconds=i * 10),
+                sender=MessageSender.CUSTOMER,
+                content=message_content,
+                intent=plan.intents[i],
+                sentiment=plan.sentiments[i]
+            )
+            for i, message_content in enumerate(SESSION_MESSAGES[:plan.msg_count])
+        ]
+        
+        # The customer still takes as long to type the messages as when each
+        # was written on its own; only the database round trips are merged
+        await asyncio.sleep(sum(plan.think_times))
+        
+        # The stress test never reads a half-built conversation, so build the whole
+        # document in memory and write it once instead of insert-then-update
+        await self.conversation_service.create_conversation_with_messages(
+            ConversationCreate(
                 customer_id=f"stress_user_{user_id}",
                 business_id=f"business_{user_id % 5}",  # 5 different businesses
-                product_context=[str(random.randint(1, 100))],
-                conversation_branch=random.choice([ConversationBranch.MANIPULATOR, ConversationBranch.CONVINCER])
-            ))
-            self.results['conversations_created'] += 1
-            
-            # 3. Add multiple messages to conversation (MongoDB UPDATE)
-            messages = [
-                "Hello, I'm interested in your products!",
-                "Can you tell me more about the pricing?",
-                "Do you have any discounts available?",
-                "What's the warranty on this item?",
-                "I'd like to proceed with the purchase."
-            ]
-            
-            for i, message_content in enumerate(messages):
-                if i >= 3 and random.random() > 0.7:  # Not all users complete full conversation
-                    break
-                    
-                message = ConversationMessage(
-                    timestamp=datetime.now(),
-                    sender=MessageSender.CUSTOMER,
-                    content=message_content,
-                    intent=random.choice(['inquiry', 'purchase_intent', 'price_check']),
-                    sentiment=random.choice(['positive', 'neutral', 'negative'])
-                )
-                
-                await conversation_service.add_message(conversation.conversation_id, message)
-                self.results['messages_added'] += 1
-                
-                # Simulate some delay between messages
-                await asyncio.sleep(random.uniform(0.01, 0.05))
-
-            # 4. Cache user session data (Redis WRITE/READ)
-            redis_client = db_manager.get_redis_client()
-            
-            # Set session data
-            session_key = f"user:{user_id}:session"
-            session_data = f"active_since_{int(time.time())}"
-            await redis_client.setex(session_key, 3600, session_data)  # 1 hour TTL
-            
-            # Set user preferences
-            prefs_key = f"user:{user_id}:preferences"
-            prefs_data = f"category:{random.choice(['electronics', 'audio', 'computing'])}"
-            await redis_client.set(prefs_key, prefs_data)
-            
-            # Read session data back
-            retrieved_session = await redis_client.get(session_key)
-            retrieved_prefs = await redis_client.get(prefs_key)
-            
-            self.results['redis_operations'] += 3  # 2 writes + 1 read
-            
-        except Exception as e:
-            logger.error(f"Error in user session {user_id}: {e}")
-            self.results['errors'] += 1
+                product_context=[plan.product_ctx],
+                conversation_branch=plan.branch
+            ),
+            session_messages
+        )
+        counters['conversations_created'] += 1
+        counters['messages_added'] += len(session_messages)
+        counters['mongo_writes'] += 1  # One insert carries the conversation and its messages
+        
+        return counters
 
-    async def run_stress_test(self, concurrent_users=50):
+    async def _do_redis(self, user_id: int, plan: SessionPlan) -> dict:
+        """Cache user session data (Redis WRITE/READ)"""
+        redis_client = db_manager.get_redis_client()
+        
+        session_key = f"user:{user_id}:session"
+        session_data = f"active_since_{int(time.time())}"
+        prefs_key = f"user:{user_id}:preferences"
+        prefs_data = f"category:{plan.preference}"
+        
+        # Queue the writes and read-backs and send them in one round-trip
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.setex(session_key, 3600, session_data)  # 1 hour TTL
+        pipe.set(prefs_key, prefs_data)
+        pipe.get(session_key)
+        pipe.get(prefs_key)
+        _, _, retrieved_session, retrieved_prefs = await pipe.execute()
+        
+        # Four commands (2 writes + 2 reads), but one round trip to the server
+        return {'redis_round_trips': 1, 'redis_commands': 4}
+
+    async def simulate_user_session(self, user_id: int, plan: SessionPlan) -> Dict[str, int]:
+        """Simulate a complete user session and return its operation counters"""
+        counters = {
+            'products_created': 0,
+            'products_read': 0,
+            'conversations_created': 0,
+            'messages_added': 0,
+            'mongo_writes': 0,
+            'redis_round_trips': 0,
+            'redis_commands': 0,
+            'errors': 0
+        }
+        
+        # The three stores have no data dependency on each other, so the
+        # phases run concurrently and their counters are merged afterwards
+        phase_results = await asyncio.gather(
+            self._do_pg(user_id, plan),
+            self._do_mongo(user_id, plan),
+            self._do_redis(user_id, plan),
+            return_exceptions=True
+        )
+        
+        for result in phase_results:
+            if isinstance(result, Exception):
+                logger.error(f"Error in user session {user_id}: {result}")
+                counters['errors'] = 1
+                continue
+            for key, value in result.items():
+                counters[key] += value
+        
+        return counters
+
+    async def run_stress_test(self, concurrent_users=50, seed: Optional[int] = None):
         """Run stress test with multiple concurrent users"""
         logger.info(f"🚀 Starting stress test with {concurrent_users} concurrent users...")
         
-        # Connect to all databases
-        await db_manager.connect_postgresql()
-        await db_manager.connect_mongodb()
-        await db_manager.connect_redis()
-        await db_manager.create_tables()
+        # Draw every session's random choices up front from one generator;
+        # passing a seed makes the run repeatable for profiling
+        rng = random.Random(seed)
+        plans = [build_session_plan(rng, user_id) for user_id in range(concurrent_users)]
         
         self.results['start_time'] = time.time()
         
-        # Create tasks for concurrent users
-        tasks = []
-        for user_id in range(concurrent_users):
-            task = self.simulate_user_session(user_id)
-            tasks.append(task)
+        if self.conversation_service is None:
+            self.conversation_service = ConversationService(db_manager.get_mongo_db())
+        
+        # Cap in-flight sessions at what the connection pools can serve
+        self.concurrent_users = concurrent_users
+        self.effective_concurrency = min(concurrent_users, MAX_CONCURRENT_SESSIONS)
+        if self.effective_concurrency < concurrent_users:
+            logger.warning(
+                f"Only {self.effective_concurrency} of {concurrent_users} sessions run at once "
+                f"(PostgreSQL pool_size + max_overflow); the rest wait for a slot"
+            )
+        semaphore = asyncio.Semaphore(self.effective_concurrency)
         
-        # Run all user sessions concurrently
+        async def gated_session(user_id: int, plan: SessionPlan) -> Dict[str, int]:
+            async with semaphore:
+                return await self.simulate_user_session(user_id, plan)
+        
+        # Each session returns its own counters, so nothing shared is written
+        # while sessions are in flight; fold them in as each one finishes
         logger.info("Running concurrent user sessions...")
-        await asyncio.gather(*tasks, return_exceptions=True)
+        tasks = [gated_session(user_id, plan) for user_id, plan in enumerate(plans)]
         
-        self.results['end_time'] = time.time()
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                counters = await next_done
+            except Exception as e:
+                logger.error(f"User session failed: {e}")
+                self.results['errors'] += 1
+                continue
+            for key, value in counters.items():
+                self.results[key] += value
         
-        await db_manager.close_connections()
+        self.results['end_time'] = time.time()
 
     def print_performance_report(self):
         """Print detailed performance report"""
         duration = self.results['end_time'] - self.results['start_time']
         
-        logger.info("\n" + "="*70)
-        logger.info("🏁 DATABASE STRESS TEST PERFORMANCE REPORT")
-        logger.info("="*70)
-        
-        logger.info(f"\n📊 TEST DURATION: {duration:.2f} seconds")
-        
-        logger.info(f"\n📈 OPERATIONS COMPLETED:")
-        logger.info(f"  Products Created: {self.results['products_created']}")
-        logger.info(f"  Products Read: {self.results['products_read']}")
-        logger.info(f"  Conversations Created: {self.results['conversations_created']}")
-        logger.info(f"  Messages Added: {self.results['messages_added']}")
-        logger.info(f"  Redis Operations: {self.results['redis_operations']}")
-        logger.info(f"  Total Operations: {sum([
-            self.results['products_created'],
-            self.results['products_read'],
-            self.results['conversations_created'],
-            self.results['messages_added'],
-            self.results['redis_operations']
-        ])}")
-        
-        logger.info(f"\n⚡ PERFORMANCE METRICS:")
+        # Operations are database round trips: conversations and messages are
+        # written in one MongoDB insert, and the Redis commands in one pipeline
         total_ops = sum([
             self.results['products_created'],
             self.results['products_read'],
-            self.results['conversations_created'],
-            self.results['messages_added'],
-            self.results['redis_operations']
+            self.results['mongo_writes'],
+            self.results['redis_round_trips']
         ])
         ops_per_second = total_ops / duration if duration > 0 else 0
-        logger.info(f"  Operations per second: {ops_per_second:.2f}")
-        logger.info(f"  Average time per operation: {(duration/total_ops)*1000:.2f}ms")
-        
-        logger.info(f"\n❌ ERRORS:")
-        logger.info(f"  Total Errors: {self.results['errors']}")
+        avg_op_ms = (duration / total_ops) * 1000 if total_ops > 0 else 0
         error_rate = (self.results['errors'] / total_ops) * 100 if total_ops > 0 else 0
-        logger.info(f"  Error Rate: {error_rate:.2f}%")
         
         # Performance assessment
         if error_rate == 0:
@@ -203,23 +295,62 @@ class StressTester:
             status = "⚠️ ACCEPTABLE"
         else:
             status = "❌ NEEDS IMPROVEMENT"
-            
-        logger.info(f"\n🏆 OVERALL PERFORMANCE: {status}")
         
         if ops_per_second > 100:
-            logger.info("💪 High throughput - Ready for production traffic")
+            throughput = "💪 High throughput - Ready for production traffic"
         elif ops_per_second > 50:
-            logger.info("👍 Good throughput - Suitable for moderate traffic")
+            throughput = "👍 Good throughput - Suitable for moderate traffic"
         else:
-            logger.info("⚠️ Consider optimization for high-traffic scenarios")
+            throughput = "⚠️ Consider optimization for high-traffic scenarios"
+        
+        # Assemble the whole report and log it as one record
+        report = "\n".join([
+            "",
+            "="*70,
+            "🏁 DATABASE STRESS TEST PERFORMANCE REPORT",
+            "="*70,
+            "",
+            f"📊 TEST DURATION: {duration:.2f} seconds",
+            f"👥 CONCURRENCY: {self.concurrent_users} users, at most {self.effective_concurrency} sessions in flight",
+            "",
+            "📈 OPERATIONS COMPLETED:",
+            f"  Products Created: {self.results['products_created']}",
+            f"  Products Read: {self.results['products_read']}",
+            f"  MongoDB Writes: {self.results['mongo_writes']}",
+            f"  Redis Pipelines: {self.results['redis_round_trips']} ({self.results['redis_commands']} commands)",
+            f"  Total Operations: {total_ops}",
+            "",
+            "📝 DATA WRITTEN TO MONGODB:",
+            f"  Conversations Created: {self.results['conversations_created']}",
+            f"  Messages Added: {self.results['messages_added']}",
+            "",
+            "⚡ PERFORMANCE METRICS:",
+            f"  Operations per second: {ops_per_second:.2f}",
+            f"  Average time per operation: {avg_op_ms:.2f}ms",
+            "",
+            "❌ ERRORS:",
+            f"  Total Errors: {self.results['errors']}",
+            f"  Error Rate: {error_rate:.2f}%",
+            "",
+            f"🏆 OVERALL PERFORMANCE: {status}",
+            throughput
+        ])
+        logger.info("%s", report)
 
 async def main():
     """Run the stress test"""
     tester = StressTester()
     
     try:
+        # Connect once and keep the pools warm across every load level,
+        # instead of paying the PostgreSQL, MongoDB and Redis handshakes per run
+        await db_manager.connect_postgresql()
+        await db_manager.connect_mongodb()
+        await db_manager.connect_redis()
+        await db_manager.create_tables()
+        
         # Test with different user loads
-        for user_count in [10, 25, 50]:
+        for user_count in LOAD_LEVELS:
             logger.info(f"\n{'='*50}")
             logger.info(f"Testing with {user_count} concurrent users")
             logger.info(f"{'='*50}")
@@ -235,6 +366,8 @@ async def main():
             
     except Exception as e:
         logger.error(f"Stress test failed: {e}")
+    finally:
+        await db_manager.close_connections()
 
 if __name__ == "__main__":
     asyncio.run(main())
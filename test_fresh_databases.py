@@ -8,17 +8,18 @@ import sys
 import os
 from pathlib import Path
 
-# Force environment reload
-os.environ.clear()
-from dotenv import load_dotenv
-load_dotenv('.env', override=True)
+# app.core.config already loads .env once at import. Set FRESH_ENV=1 to have
+# .env values override variables inherited from the shell as well
+if os.getenv("FRESH_ENV"):
+    from dotenv import load_dotenv
+    load_dotenv('.env', override=True)
 
 # Add the project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 # Now import after environment is set
-from app.core.config import Settings
+from app.core.config import settings
 from app.core.database import DatabaseManager
 from app.services.product_service import ProductService
 from app.services.conversation_service import ConversationService
@@ -28,8 +29,7 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create fresh settings and database manager
-settings = Settings()
+# Create a fresh database manager; settings are the shared module instance
 db_manager = DatabaseManager()
 
 async def test_postgresql():
@@ -0,0 +1,70 @@
+"""
+Unit tests for the Azure OpenAI response cache
+Covers TTL expiry, LRU eviction and prompt normalization in cache keys
+"""
+
+from unittest.mock import patch
+
+from app.services.response_cache import ResponseCache, normalize_prompt
+
+
+def make_messages(user_content: str):
+    return [
+        {"role": "system", "content": "You are a keyword extraction specialist. Return only JSON arrays."},
+        {"role": "user", "content": user_content}
+    ]
+
+
+class TestResponseCache:
+    """ResponseCache behaviour without any Azure OpenAI calls"""
+
+    def test_entry_expires_after_ttl(self):
+        cache = ResponseCache(maxsize=10, ttl_seconds=60.0)
+        key = ResponseCache.make_key(make_messages("wireless headphones"), 200, 0.3)
+
+        with patch("app.services.response_cache.time.monotonic", return_value=1000.0):
+            cache.put(key, '["headphones", "wireless"]')
+        with patch("app.services.response_cache.time.monotonic", return_value=1060.0):
+            assert cache.lookup(key) == '["headphones", "wireless"]'
+        with patch("app.services.response_cache.time.monotonic", return_value=1060.5):
+            assert cache.lookup(key) is None
+
+        stats = cache.get_statistics()
+        assert stats["size"] == 0
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_least_recently_used_entry_is_evicted_at_maxsize(self):
+        cache = ResponseCache(maxsize=2, ttl_seconds=3600.0)
+        first, second, third = (
+            ResponseCache.make_key(make_messages(text), 200, 0.3)
+            for text in ("laptop", "camera", "smartphone")
+        )
+
+        cache.put(first, "first")
+        cache.put(second, "second")
+        # Touching the first entry leaves the second as least recently used
+        assert cache.lookup(first) == "first"
+        cache.put(third, "third")
+
+        assert cache.get_statistics()["size"] == 2
+        assert cache.lookup(second) is None
+        assert cache.lookup(first) == "first"
+        assert cache.lookup(third) == "third"
+
+    def test_key_ignores_case_and_whitespace(self):
+        assert normalize_prompt("  Wireless\n\tHEADPHONES  ") == "wireless headphones"
+
+        key = ResponseCache.make_key(make_messages("Wireless  Headphones\n"), 200, 0.3)
+        same_key = ResponseCache.make_key(make_messages("wireless headphones"), 200, 0.3)
+        assert key == same_key
+
+    def test_key_separates_roles_and_sampling_parameters(self):
+        messages = make_messages("wireless headphones")
+        key = ResponseCache.make_key(messages, 200, 0.3)
+
+        assert key != ResponseCache.make_key(messages, 150, 0.3)
+        assert key != ResponseCache.make_key(messages, 200, 0.7)
+        assert key != ResponseCache.make_key(
+            [{"role": "user", "content": m["content"]} for m in messages], 200, 0.3
+        )
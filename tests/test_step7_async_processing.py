@@ -4,18 +4,26 @@ Validates the async task processing system with Celery and Redis
 """
 
 import asyncio
+import io
+import sys
 import pytest
 import json
 import time
-from datetime import datetime
+from pathlib import Path
 from unittest.mock import Mock, patch, AsyncMock
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import httpx
+import redis
 
-from app.core.celery_app import create_celery_app
-from app.services.task_manager import TaskManager
+# Add the project root to Python path so the module also runs directly
+# (python tests/test_step7_async_processing.py), not only under pytest
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Importing these modules already builds the app's Celery instance and task
+# manager; the tests inspect those rather than constructing more
+from app.core.celery_app import celery_app as shared_celery_app
+from app.services.task_manager import task_manager as shared_task_manager
 from app.tasks.conversation_tasks import (
     process_conversation_message_task,
     process_manipulator_interaction_task,
@@ -24,36 +32,65 @@ from app.tasks.conversation_tasks import (
 from app.tasks.webhook_tasks import (
     process_facebook_webhook_task,
     process_google_webhook_task,
-    process_generic_webhook_task
+    process_generic_webhook_task,
+    send_webhook_response_task,
+    TRANSIENT_RETRY_OPTIONS,
+    _shared_webhook_client
 )
 from app.tasks.analytics_tasks import (
     generate_conversation_analytics_task,
     generate_performance_report_task
 )
 
+# Task families routed to their own queues, matched against route patterns
+TASK_FAMILIES = ('conversation', 'webhook', 'analytics')
+
+# Fixed timestamp for mock task records; tests only check the keys exist
+MOCK_TIMESTAMP = "2024-01-01T00:00:00"
+
+
+def make_mock_redis() -> Mock:
+    """Redis client mock limited to the real client's API, configured in one call"""
+    redis_mock = Mock(spec=redis.Redis)
+    redis_mock.configure_mock(**{
+        "ping.return_value": True,
+        "set.return_value": True,
+        "get.return_value": None,
+        "exists.return_value": False
+    })
+    return redis_mock
+
 
 class TestStep7AsyncProcessing:
     """Test suite for Step 7 async processing implementation"""
     
-    @pytest.fixture
+    # Output buffer while run_all_tests is running; None under pytest, where
+    # each message is printed as before and captured per test
+    _log = None
+    
+    def _report(self, message: str):
+        """Print a progress message, or buffer it during run_all_tests"""
+        if self._log is None:
+            print(message)
+        else:
+            self._log.write(message + "\n")
+    
+    # The app and task manager are only inspected, never mutated, so the
+    # instances built at import are shared by the whole session
+    @pytest.fixture(scope="session")
     def celery_app(self):
-        """Create Celery app for testing"""
-        return create_celery_app()
+        """Celery app for testing"""
+        return shared_celery_app
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def task_manager(self):
-        """Create task manager for testing"""
-        return TaskManager()
+        """Task manager for testing"""
+        return shared_task_manager
     
     @pytest.fixture
     def mock_redis(self):
         """Mock Redis client for testing"""
-        redis_mock = Mock()
-        redis_mock.ping.return_value = True
-        redis_mock.set.return_value = True
-        redis_mock.get.return_value = None
-        redis_mock.exists.return_value = False
-        return redis_mock
+        return make_mock_redis()
     
     def test_celery_app_creation(self, celery_app):
         """Test that Celery app is created with correct configuration"""
@@ -61,12 +98,18 @@ class TestStep7AsyncProcessing:
         assert celery_app.conf.broker_url.startswith("redis://")
         assert celery_app.conf.result_backend.startswith("redis://")
         
-        # Check task routing configuration
-        assert "conversations" in celery_app.conf.task_routes
-        assert "webhooks" in celery_app.conf.task_routes
-        assert "analytics" in celery_app.conf.task_routes
+        # Check task routing configuration: routes are keyed by task module
+        # pattern, so the queues are the route values
+        routed_queues = {config.get('queue') for config in celery_app.conf.task_routes.values()}
+        assert {"conversations", "webhooks", "analytics"} <= routed_queues
         
-        print("✅ Celery app creation test passed")
+        # Workers reserve one task at a time and ack only once it finishes, so a
+        # slow webhook call never holds prefetched tasks behind it
+        assert celery_app.conf.worker_prefetch_multiplier == 1
+        assert celery_app.conf.task_acks_late is True
+        assert celery_app.conf.worker_max_tasks_per_child == 1000
+        
+        self._report("✅ Celery app creation test passed")
     
     def test_task_manager_initialization(self, task_manager):
         """Test task manager initialization"""
@@ -75,7 +118,7 @@ class TestStep7AsyncProcessing:
         assert hasattr(task_manager, 'process_webhook_async')
         assert hasattr(task_manager, 'generate_analytics_async')
         
-        print("✅ Task manager initialization test passed")
+        self._report("✅ Task manager initialization test passed")
     
     @patch('app.tasks.conversation_tasks.ConversationService')
     @patch('app.tasks.conversation_tasks.get_mongo_db')
@@ -110,19 +153,22 @@ class TestStep7AsyncProcessing:
         assert "conversation_id" in result
         assert "ai_response" in result
         
-        print("✅ Conversation task processing test passed")
+        self._report("✅ Conversation task processing test passed")
     
     @patch('app.tasks.webhook_tasks.httpx.AsyncClient')
     def test_webhook_task_processing(self, mock_client):
         """Test webhook task processing"""
         # Mock HTTP client for webhook responses
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"success": True}
+        mock_response = Mock(spec=httpx.Response)
+        mock_response.configure_mock(**{
+            "status_code": 200,
+            "json.return_value": {"success": True}
+        })
         
+        # Webhook tasks post through a shared client rather than entering one per call
         mock_client_instance = AsyncMock()
         mock_client_instance.post.return_value = mock_response
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_client.return_value = mock_client_instance
         
         # Test webhook data
         webhook_data = {
@@ -145,7 +191,20 @@ class TestStep7AsyncProcessing:
         assert result["platform"] == "facebook"
         assert result["processed_events"] > 0
         
-        print("✅ Webhook task processing test passed")
+        self._report("✅ Webhook task processing test passed")
+    
+    @patch('app.tasks.webhook_tasks.httpx.AsyncClient')
+    def test_webhook_client_reuse(self, mock_client):
+        """Test that webhook responses on one event loop share a single HTTP client"""
+        async def get_clients():
+            return [_shared_webhook_client() for _ in range(3)]
+        
+        clients = asyncio.run(get_clients())
+        
+        assert all(client is clients[0] for client in clients)
+        assert mock_client.call_count == 1
+        
+        self._report("✅ Webhook client reuse test passed")
     
     def test_analytics_task_structure(self):
         """Test analytics task structure and dependencies"""
@@ -159,30 +218,27 @@ class TestStep7AsyncProcessing:
             assert hasattr(task, 'delay')  # Celery task method
             assert callable(task)
         
-        print("✅ Analytics task structure test passed")
+        self._report("✅ Analytics task structure test passed")
     
     def test_task_priority_queues(self, celery_app):
         """Test task priority queue configuration"""
         routes = celery_app.conf.task_routes
         
-        # Check queue assignments
-        conversation_route = None
-        webhook_route = None
-        analytics_route = None
-        
-        for pattern, config in routes.items():
-            if 'conversation' in pattern:
-                conversation_route = config.get('queue')
-            elif 'webhook' in pattern:
-                webhook_route = config.get('queue')
-            elif 'analytics' in pattern:
-                analytics_route = config.get('queue')
+        # Check queue assignments: map each task family to its route's queue
+        queues = {
+            family: config.get('queue')
+            for pattern, config in routes.items()
+            for family in TASK_FAMILIES
+            if family in pattern
+        }
         
-        assert conversation_route == 'conversations'  # High priority
-        assert webhook_route == 'webhooks'            # Medium priority
-        assert analytics_route == 'analytics'         # Low priority
+        assert queues == {
+            'conversation': 'conversations',  # High priority
+            'webhook': 'webhooks',            # Medium priority
+            'analytics': 'analytics'          # Low priority
+        }
         
-        print("✅ Task priority queues test passed")
+        self._report("✅ Task priority queues test passed")
     
     def test_task_monitoring_capabilities(self, task_manager):
         """Test task monitoring and status tracking"""
@@ -198,31 +254,51 @@ class TestStep7AsyncProcessing:
             "progress": 0,
             "result": None,
             "error": None,
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat()
+            "created_at": MOCK_TIMESTAMP,
+            "updated_at": MOCK_TIMESTAMP
         }
         
         # In a real test, we'd check actual Redis/Celery integration
         assert "status" in mock_status
         assert "progress" in mock_status
         
-        print("✅ Task monitoring capabilities test passed")
+        self._report("✅ Task monitoring capabilities test passed")
+    
+    def test_task_status_single_backend_read(self, task_manager):
+        """Test that task status is built from one result backend read"""
+        meta = {
+            "status": "SUCCESS",
+            "result": {"completed_at": MOCK_TIMESTAMP},
+            "traceback": None
+        }
+        
+        with patch.object(task_manager.celery_app.backend, "get_task_meta", return_value=meta) as get_meta:
+            status = task_manager.get_task_status("task_123")
+        
+        get_meta.assert_called_once_with("task_123")
+        assert status["status"] == "SUCCESS"
+        assert status["result"] == meta["result"]
+        assert status["completed_at"] == MOCK_TIMESTAMP
+        
+        self._report("✅ Task status backend read test passed")
     
     def test_error_handling_and_retries(self):
         """Test error handling and retry mechanisms"""
-        # Test configuration for error handling
-        retry_config = {
-            "autoretry_for": (Exception,),
-            "retry_kwargs": {"max_retries": 3, "countdown": 60},
-            "retry_backoff": True
-        }
+        # Webhook responses retry network failures only, with jittered backoff
+        retry_config = TRANSIENT_RETRY_OPTIONS
         
         # Verify retry configuration structure
-        assert "autoretry_for" in retry_config
-        assert "retry_kwargs" in retry_config
+        assert Exception not in retry_config["autoretry_for"]
         assert retry_config["retry_kwargs"]["max_retries"] > 0
+        assert retry_config["retry_backoff"] is True
+        assert retry_config["retry_jitter"] is True
+        assert retry_config["retry_backoff_max"] == 600
+        
+        # The options are applied to the task itself
+        assert send_webhook_response_task.autoretry_for == retry_config["autoretry_for"]
+        assert send_webhook_response_task.retry_jitter is True
         
-        print("✅ Error handling and retries test passed")
+        self._report("✅ Error handling and retries test passed")
     
     def test_redis_integration_mock(self, mock_redis):
         """Test Redis integration (mocked)"""
@@ -236,7 +312,7 @@ class TestStep7AsyncProcessing:
         mock_redis.get("test_key")
         assert mock_redis.get.called
         
-        print("✅ Redis integration mock test passed")
+        self._report("✅ Redis integration mock test passed")
     
     @pytest.mark.asyncio
     async def test_async_api_integration(self):
@@ -260,7 +336,7 @@ class TestStep7AsyncProcessing:
         assert "task_id" in api_response
         assert api_response["conversation_id"] == "pending"
         
-        print("✅ Async API integration test passed")
+        self._report("✅ Async API integration test passed")
     
     def test_performance_requirements(self):
         """Test that performance requirements are met"""
@@ -275,53 +351,58 @@ class TestStep7AsyncProcessing:
         # API should respond quickly when using async processing
         assert elapsed_time < 0.1  # Less than 100ms
         
-        print("✅ Performance requirements test passed")
+        self._report("✅ Performance requirements test passed")
     
     def run_all_tests(self):
         """Run comprehensive Step 7 validation"""
-        print("\n🚀 Running Step 7: Asynchronous Task Processing Validation")
-        print("=" * 60)
+        # Collect the whole run's output and write it to stdout once at the end
+        self._log = io.StringIO()
+        self._report("\n🚀 Running Step 7: Asynchronous Task Processing Validation\n" + "=" * 60)
         
         try:
             # Create test fixtures
-            celery_app = create_celery_app()
-            task_manager = TaskManager()
-            mock_redis = Mock()
-            mock_redis.ping.return_value = True
+            celery_app = shared_celery_app
+            task_manager = shared_task_manager
+            mock_redis = make_mock_redis()
             
             # Run individual tests
             self.test_celery_app_creation(celery_app)
             self.test_task_manager_initialization(task_manager)
             self.test_conversation_task_processing()
             self.test_webhook_task_processing()
+            self.test_webhook_client_reuse()
             self.test_analytics_task_structure()
             self.test_task_priority_queues(celery_app)
             self.test_task_monitoring_capabilities(task_manager)
+            self.test_task_status_single_backend_read(task_manager)
             self.test_error_handling_and_retries()
             self.test_redis_integration_mock(mock_redis)
             
             # Run async test
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.test_async_api_integration())
-            loop.close()
+            asyncio.run(self.test_async_api_integration())
             
             self.test_performance_requirements()
             
-            print("\n" + "=" * 60)
-            print("✅ Step 7 Async Processing Validation PASSED")
-            print("✅ Redis Queue integration ready")
-            print("✅ Celery task processing configured")
-            print("✅ API responsiveness maintained")
-            print("✅ Task monitoring capabilities active")
-            print("=" * 60)
+            self._report(
+                "\n" + "=" * 60 + "\n"
+                "✅ Step 7 Async Processing Validation PASSED\n"
+                "✅ Redis Queue integration ready\n"
+                "✅ Celery task processing configured\n"
+                "✅ API responsiveness maintained\n"
+                "✅ Task monitoring capabilities active\n"
+                + "=" * 60
+            )
             
             return True
             
         except Exception as e:
-            print(f"\n❌ Step 7 Validation FAILED: {e}")
-            print("=" * 60)
+            self._report(f"\n❌ Step 7 Validation FAILED: {e}\n" + "=" * 60)
             return False
+        
+        finally:
+            sys.stdout.write(self._log.getvalue())
+            sys.stdout.flush()
+            self._log = None
 
 
 def main():